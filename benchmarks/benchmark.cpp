@@ -37,8 +37,9 @@ double calculate_percentile(std::vector<double>& latencies, double percentile) {
     return latencies[index];
 }
 
-void benchmark_order_insertion(size_t num_orders) {
-    OrderBook ob("BENCHMARK");
+template <typename Book>
+void benchmark_order_insertion(size_t num_orders, const char* title) {
+    Book ob("BENCHMARK");
     std::mt19937 gen(42);
     std::uniform_real_distribution<> price_dist(99.0, 101.0);
     std::uniform_int_distribution<> qty_dist(1, 100);
@@ -53,7 +54,8 @@ void benchmark_order_insertion(size_t num_orders) {
         ob.add_limit_order(i, side, price_dist(gen), qty_dist(gen));
     }
     
-    OrderBook ob2("BENCHMARK");
+    Book ob2("BENCHMARK");
+    ob2.reserve(num_orders);
     Timer total_timer;
     for (size_t i = 0; i < num_orders; ++i) {
         Side side = side_dist(gen) == 0 ? Side::BUY : Side::SELL;
@@ -66,7 +68,7 @@ void benchmark_order_insertion(size_t num_orders) {
     }
     double elapsed = total_timer.elapsed_ms();
     
-    std::cout << "Order Insertion Benchmark:\n";
+    std::cout << title << ":\n";
     std::cout << "  Total orders: " << num_orders << "\n";
     std::cout << "  Time: " << std::fixed << std::setprecision(2) << elapsed << " ms\n";
     std::cout << "  Throughput: " << std::fixed << std::setprecision(0) 
@@ -86,6 +88,7 @@ void benchmark_order_cancellation(size_t num_orders) {
     std::mt19937 gen(42);
     std::uniform_real_distribution<> price_dist(99.0, 101.0);
     std::uniform_int_distribution<> qty_dist(1, 100);
+    ob.reserve(num_orders);
     
     // Insert orders
     for (size_t i = 0; i < num_orders; ++i) {
@@ -211,6 +214,28 @@ void benchmark_market_data_queries() {
     std::cout << "  Throughput: " << std::fixed << std::setprecision(0)
               << (num_depth / (elapsed2 / 1e6)) << " queries/sec\n";
     std::cout << "  (checksum: depth_sink=" << depth_sink << ")\n\n";
+    
+    // Benchmark snapshots: best bid/ask plus 10 levels per side in one call
+    double bid_prices[10], ask_prices[10];
+    uint64_t bid_volumes[10], ask_volumes[10];
+    
+    COMPILER_BARRIER();
+    Timer timer3;
+    for (size_t i = 0; i < num_depth; ++i) {
+        BookSnapshot snap = ob.snapshot(bid_prices, bid_volumes, ask_prices, ask_volumes, 10);
+        depth_sink += snap.bid_levels + snap.ask_levels;
+    }
+    COMPILER_BARRIER();
+    double elapsed3 = timer3.elapsed_us();
+    
+    std::cout << "  Snapshots (best bid/ask + 10 levels): " << num_depth << "\n";
+    std::cout << "  Time: " << std::fixed << std::setprecision(2)
+              << (elapsed3 / 1000.0) << " ms total\n";
+    std::cout << "  Latency: " << std::fixed << std::setprecision(4) 
+              << (elapsed3 / num_depth) << " µs/query\n";
+    std::cout << "  Throughput: " << std::fixed << std::setprecision(0)
+              << (num_depth / (elapsed3 / 1e6)) << " queries/sec\n";
+    std::cout << "  (checksum: depth_sink=" << depth_sink << ")\n\n";
 }
 
 void print_system_info() {
@@ -247,7 +272,9 @@ int main() {
     
     print_system_info();
     
-    benchmark_order_insertion(100000);
+    benchmark_order_insertion<OrderBook>(100000, "Order Insertion Benchmark");
+    benchmark_order_insertion<FixedTickOrderBook<1, 100>>(
+        100000, "Order Insertion Benchmark (Fixed 0.01 Tick)");
     benchmark_order_cancellation(100000);
     benchmark_matching_engine(10000);
     benchmark_market_data_queries();
@@ -1,79 +1,229 @@
 #pragma once
 
+#include <algorithm>
+#include <cassert>
+#include <cmath>
+#include <cstddef>
 #include <cstdint>
 #include <map>
-#include <deque>
-#include <unordered_map>
-#include <memory>
+#include <memory_resource>
 #include <string>
 #include <optional>
 #include <limits>
+#include <vector>
 
 namespace hft {
 
 enum class Side : uint8_t {
-    BUY,
-    SELL
+    BUY = 0,
+    SELL = 1
 };
 
+// Sides double as array indices: per-side state is indexed by the side bit
+// and the opposite side is side_index(side) ^ 1, so no code branches on side
+constexpr size_t side_index(Side side) {
+    // Values other than BUY/SELL would index per-side arrays out of bounds;
+    // the public entry points that accept raw bytes validate before this
+    assert(static_cast<size_t>(side) < 2);
+    return static_cast<size_t>(side);
+}
+
 enum class OrderType : uint8_t {
     LIMIT,
     MARKET
 };
 
-// Sentinel value for market orders (use max double instead of 0.0)
-constexpr double MARKET_ORDER_PRICE = std::numeric_limits<double>::max();
+// Sentinel price for market orders (max tick instead of 0)
+constexpr int64_t MARKET_ORDER_TICKS = std::numeric_limits<int64_t>::max();
+
+struct Trade {
+    uint64_t buy_order_id;
+    uint64_t sell_order_id;
+    double price;
+    uint64_t quantity;
+    uint64_t timestamp;
+};
+
+// Best prices plus level counts from one OrderBook::snapshot call; the level
+// prices and volumes themselves go to caller-owned buffers
+struct BookSnapshot {
+    std::optional<double> best_bid;
+    std::optional<double> best_ask;
+    size_t bid_levels;
+    size_t ask_levels;
+};
 
 struct Order {
     uint64_t order_id;
     Side side;
-    double price;
+    int64_t price_ticks;
     uint64_t quantity;
     uint64_t timestamp;
     OrderType type;
     
-    Order(uint64_t id, Side s, double p, uint64_t qty, uint64_t ts, OrderType t = OrderType::LIMIT)
-        : order_id(id), side(s), price(p), quantity(qty), timestamp(ts), type(t) {}
+    Order(uint64_t id, Side s, int64_t p, uint64_t qty, uint64_t ts, OrderType t = OrderType::LIMIT)
+        : order_id(id), side(s), price_ticks(p), quantity(qty), timestamp(ts), type(t) {}
 };
 
-struct Trade {
-    uint64_t buy_order_id;
-    uint64_t sell_order_id;
-    double price;
-    uint64_t quantity;
-    uint64_t timestamp;
-};
+// Index of a resting order in the OrderTable
+using Slot = uint32_t;
+constexpr Slot NULL_SLOT = std::numeric_limits<Slot>::max();
 
-// Price level containing all orders at a specific price
+// Price level containing all orders at a specific price (in ticks).
+// Orders form a FIFO threaded through the OrderTable's next/prev links.
 struct PriceLevel {
-    double price;
+    int64_t price_ticks;
     uint64_t total_volume;
-    std::deque<std::shared_ptr<Order>> orders;
+    Slot head; // Oldest order, first to fill
+    Slot tail;
     
-    explicit PriceLevel(double p) : price(p), total_volume(0) {}
+    explicit PriceLevel(int64_t p)
+        : price_ticks(p), total_volume(0), head(NULL_SLOT), tail(NULL_SLOT) {}
     
-    void add_order(std::shared_ptr<Order> order) {
-        orders.push_back(order);
-        total_volume += order->quantity;
+    bool is_empty() const {
+        return head == NULL_SLOT;
     }
+};
+
+// Price levels ordered by priority key: the first level is the best on
+// either side (asks are keyed by price, bids by negated price), so both
+// sides share one container and one iterator type. Nodes come from a pool
+// resource owned by the book, so level churn reuses freed nodes.
+using LevelMap = std::pmr::map<int64_t, PriceLevel>;
+
+inline int64_t level_key(Side side, int64_t price_ticks) {
+    // BUY -> -1, SELL -> +1
+    int64_t sign = 2 * static_cast<int64_t>(side) - 1;
+    return sign * price_ticks;
+}
+
+// Resting orders stored as parallel arrays (struct-of-arrays) indexed by slot.
+// Matching and level walks touch only quantity/next/prev; identity and
+// bookkeeping fields live in separate arrays. Released slots go on a free
+// list and are handed out again before the arrays grow, so once capacity
+// is reserved the steady state performs no allocations.
+struct OrderTable {
+    std::vector<uint64_t> quantity;
+    std::vector<Slot> next;
+    std::vector<Slot> prev;
+    std::vector<uint64_t> order_id;
+    std::vector<Side> side;
+    std::vector<LevelMap::iterator> level;
+    std::vector<Slot> free_slots;
     
-    void remove_order(uint64_t order_id) {
-        auto it = std::find_if(orders.begin(), orders.end(),
-            [order_id](const auto& order) { return order->order_id == order_id; });
-        if (it != orders.end()) {
-            total_volume -= (*it)->quantity;
-            orders.erase(it);
-        }
-    }
+    Slot allocate(uint64_t id, Side s, uint64_t qty, LevelMap::iterator level_it);
+    void release(Slot slot) { free_slots.push_back(slot); }
+    void reserve(size_t count);
     
-    bool is_empty() const {
-        return orders.empty();
+    // FIFO maintenance; the level's total_volume tracks linked quantities
+    void append(PriceLevel& lvl, Slot slot);
+    void unlink(PriceLevel& lvl, Slot slot);
+};
+
+// Order ID -> slot hash index: open addressing with linear probing over a
+// flat power-of-two table. Deletion shifts later entries back instead of
+// leaving tombstones, so probe chains stay short under heavy cancel churn.
+class OrderIndex {
+public:
+    OrderIndex();
+    
+    Slot find(uint64_t order_id) const; // NULL_SLOT if absent
+    bool contains(uint64_t order_id) const { return find(order_id) != NULL_SLOT; }
+    void insert(uint64_t order_id, Slot slot); // order_id must not be present
+    Slot erase(uint64_t order_id); // Returns the removed slot, or NULL_SLOT
+    void reserve(size_t count);
+    size_t size() const { return size_; }
+    
+private:
+    struct Entry {
+        uint64_t order_id;
+        Slot slot; // NULL_SLOT marks an empty bucket
+    };
+    
+    size_t home(uint64_t order_id) const {
+        // Fibonacci hashing spreads sequential IDs across the table
+        return static_cast<size_t>((order_id * 0x9E3779B97F4A7C15ULL) >> shift_);
     }
+    void rehash(size_t capacity);
+    
+    std::vector<Entry> entries_;
+    size_t mask_;
+    unsigned shift_;
+    size_t size_;
 };
 
-class OrderBook {
+// Per-tick bucket index over a window of priority keys on one side of the
+// book (PIN-style). Each bucket holds the level at that key and a bitmap marks
+// occupied buckets, so an existing level is found in O(1) and a new level's
+// in-order successor is found with a word scan; the LevelMap insert then takes
+// that successor as an exact hint instead of descending the tree. Keys outside
+// the window fall back to ordinary map operations. The window can only be
+// re-centred while the side is empty, so every map key inside it is indexed.
+class LevelIndex {
 public:
-    OrderBook(const std::string& symbol);
+    static constexpr size_t WINDOW = 4096; // Buckets (ticks) per side
+    
+    LevelIndex();
+    
+    // Centres the window on key; the side's LevelMap must be empty
+    void recenter(int64_t key);
+    bool covers(int64_t key) const { return offset(key) < WINDOW; }
+    // Level at key; false if the key is absent or outside the window
+    bool find(int64_t key, LevelMap::iterator& level_it) const;
+    // Nearest indexed level with a key greater than key; false if none in the window
+    bool next_occupied(int64_t key, LevelMap::iterator& level_it) const;
+    // Both are no-ops for keys outside the window
+    void insert(int64_t key, LevelMap::iterator level_it);
+    void erase(int64_t key);
+    
+private:
+    static constexpr size_t WORD_BITS = 64;
+    
+    // Bucket of key relative to the window origin; unsigned so keys near the
+    // int64 limits wrap instead of overflowing
+    uint64_t offset(int64_t key) const { return static_cast<uint64_t>(key) - base_; }
+    
+    uint64_t base_;
+    std::vector<LevelMap::iterator> levels_;
+    std::vector<uint64_t> occupied_;
+};
+
+// Tick policies decide how a book converts between prices and integer ticks.
+// RuntimeTick takes the tick size at construction. FixedTick<Num, Den> fixes
+// it at Num/Den, so the conversion factors fold into compile-time constants.
+class RuntimeTick {
+public:
+    // Implicit so that OrderBook(symbol, tick_size) reads naturally
+    RuntimeTick(double tick_size = 0.01);
+    
+    double tick_size() const { return tick_size_; }
+    double ticks_per_unit() const { return ticks_per_unit_; }
+    
+private:
+    double tick_size_;
+    double ticks_per_unit_;
+};
+
+template <int64_t Num, int64_t Den>
+struct FixedTick {
+    static_assert(Num > 0 && Den > 0, "tick size must be positive");
+    
+    static constexpr double tick_size() { return static_cast<double>(Num) / Den; }
+    static constexpr double ticks_per_unit() { return static_cast<double>(Den) / Num; }
+};
+
+template <typename TickPolicy>
+class BasicOrderBook {
+public:
+    // Prices are rounded to the nearest multiple of the tick size on entry
+    explicit BasicOrderBook(const std::string& symbol, TickPolicy ticks = TickPolicy());
+    
+    // Level maps and cached level pointers refer into this book's storage
+    BasicOrderBook(const BasicOrderBook&) = delete;
+    BasicOrderBook& operator=(const BasicOrderBook&) = delete;
+    
+    // Pre-size order storage so up to order_count resting orders never allocate
+    void reserve(size_t order_count);
     
     // Order management
     bool add_limit_order(uint64_t order_id, Side side, double price, uint64_t quantity);
@@ -81,49 +231,108 @@ public:
     bool cancel_order(uint64_t order_id);
     bool modify_order(uint64_t order_id, uint64_t new_quantity);
     
+    // Batch insertion over parallel arrays; returns number of orders accepted
+    size_t add_limit_orders(const uint64_t* order_ids, const Side* sides,
+                            const double* prices, const uint64_t* quantities,
+                            size_t count);
+    
     // Query methods
     __attribute__((noinline)) std::optional<double> get_best_bid() const;
     __attribute__((noinline)) std::optional<double> get_best_ask() const;
+    // Best bid and best ask read together in a single call
+    __attribute__((noinline)) std::pair<std::optional<double>, std::optional<double>>
+    get_top_of_book() const;
     std::optional<double> get_mid_price() const;
     std::optional<double> get_spread() const;
     uint64_t get_bid_volume_at_price(double price) const;
     uint64_t get_ask_volume_at_price(double price) const;
-    uint64_t get_total_bid_volume() const;
-    uint64_t get_total_ask_volume() const;
+    uint64_t get_total_bid_volume() const { return total_volume_[BID]; }
+    uint64_t get_total_ask_volume() const { return total_volume_[ASK]; }
     
     // Market depth (top N levels)
     std::vector<std::pair<double, uint64_t>> get_bids(size_t depth = 10) const;
     std::vector<std::pair<double, uint64_t>> get_asks(size_t depth = 10) const;
     
+    // Market depth into caller-owned buffers of at least `depth` entries;
+    // returns the number of levels written
+    size_t get_bids_into(double* prices, uint64_t* volumes, size_t depth) const;
+    size_t get_asks_into(double* prices, uint64_t* volumes, size_t depth) const;
+    
+    // Best bid/ask and the top `depth` levels of both sides in a single call,
+    // so all fields describe the same book state
+    BookSnapshot snapshot(double* bid_prices, uint64_t* bid_volumes,
+                          double* ask_prices, uint64_t* ask_volumes, size_t depth) const;
+    
     // Trade history
     const std::vector<Trade>& get_trades() const { return trades_; }
     
     // Statistics
     size_t get_order_count() const { return orders_.size(); }
+    size_t get_bid_level_count() const { return books_[BID].size(); }
+    size_t get_ask_level_count() const { return books_[ASK].size(); }
     size_t get_trade_count() const { return trades_.size(); }
     
     const std::string& get_symbol() const { return symbol_; }
+    double get_tick_size() const { return ticks_.tick_size(); }
+    
+    // Tick conversion; to_ticks returns nullopt for non-positive or unrepresentable prices
+    std::optional<int64_t> to_ticks(double price) const;
+    double to_price(int64_t price_ticks) const { return price_ticks / ticks_.ticks_per_unit(); }
     
 private:
-    void match_order(std::shared_ptr<Order> order);
-    void execute_trade(std::shared_ptr<Order> buy_order, 
-                      std::shared_ptr<Order> sell_order,
-                      uint64_t quantity);
+    // Per-side array slots
+    static constexpr size_t BID = side_index(Side::BUY);
+    static constexpr size_t ASK = side_index(Side::SELL);
+    
+    bool add_limit_order_ticks(uint64_t order_id, Side side, int64_t price_ticks, uint64_t quantity);
+    void match_order(Order& order);
+    void rest_order(const Order& order);
+    void remove_level(size_t side, LevelMap::iterator level_it);
+    size_t copy_levels(const LevelMap& book, double* prices, uint64_t* volumes,
+                       size_t depth) const;
+    void execute_trade(uint64_t buy_order_id, uint64_t sell_order_id,
+                       int64_t price_ticks, uint64_t quantity);
     
     std::string symbol_;
+    TickPolicy ticks_;
     uint64_t timestamp_counter_;
     
-    // Price levels: price -> PriceLevel
-    // Bids: highest to lowest (using std::greater)
-    std::map<double, PriceLevel, std::greater<double>> bids_;
-    // Asks: lowest to highest (using std::less - default)
-    std::map<double, PriceLevel> asks_;
+    // Backing store for level map nodes; declared before the maps that use it
+    std::pmr::unsynchronized_pool_resource level_pool_;
+    
+    // Price levels per side (indexed by Side): priority key -> PriceLevel
+    // Bids: highest to lowest (keyed by -price)
+    // Asks: lowest to highest (keyed by price)
+    LevelMap books_[2];
+    
+    // Per-tick bucket index in front of each side's level map
+    LevelIndex level_index_[2];
+    
+    // Price level cache: top-of-book levels, nullptr when the side is empty.
+    // Map nodes are stable, so these stay valid until the level is erased.
+    PriceLevel* best_level_[2];
     
-    // Order tracking
-    std::unordered_map<uint64_t, std::shared_ptr<Order>> orders_;
+    // Running per-side volume, kept in step with the level totals
+    uint64_t total_volume_[2];
+    
+    // Resting order storage and order ID -> slot lookup
+    OrderTable table_;
+    OrderIndex orders_;
     
     // Trade history
     std::vector<Trade> trades_;
 };
 
+// Instantiated once in orderbook.cpp
+extern template class BasicOrderBook<RuntimeTick>;
+extern template class BasicOrderBook<FixedTick<1, 100>>;
+extern template class BasicOrderBook<FixedTick<1, 10000>>;
+
+// General-purpose book with the tick size chosen at runtime
+using OrderBook = BasicOrderBook<RuntimeTick>;
+
+// Book with the tick size fixed at compile time (e.g. FixedTickOrderBook<1, 100>)
+template <int64_t Num, int64_t Den>
+using FixedTickOrderBook = BasicOrderBook<FixedTick<Num, Den>>;
+
 } // namespace hft
@@ -6,125 +6,305 @@ Measures throughput and latency for various operations.
 import sys
 sys.path.insert(0, '.')
 
+import gc
+import statistics
 import time
-import random
-from pyorderbook import OrderBook, Side
+from contextlib import contextmanager
+import numpy as np
+from pyorderbook import OrderBook, Side, c_api
+
+try:
+    import llvmlite.binding as llvm
+    from numba import njit, types
+except ImportError:  # numba is optional; the kernel benchmarks are skipped without it
+    njit = None
+
+# Timed trials per benchmark; the reported time is their median
+TRIALS = 9
+
+# Each benchmark draws its workload from a fresh generator with this seed, so
+# its inputs do not depend on which benchmarks ran before it
+SEED = 42
+
+if njit is not None:
+    # Bind the C entry points by symbol name rather than as ctypes pointers, so
+    # the compiled kernels can be cached on disk across runs
+    for name, address in c_api.items():
+        llvm.add_symbol("pyorderbook_" + name, address)
+    c_top_of_book = types.ExternalFunction(
+        "pyorderbook_top_of_book", types.void(types.uintp, types.voidptr))
+    c_depth_into = types.ExternalFunction(
+        "pyorderbook_depth_into",
+        types.uintp(types.uintp, types.uint8, types.voidptr, types.voidptr, types.uintp))
+    
+    @njit(cache=True)
+    def top_of_book_kernel(book, num_queries):
+        out = np.empty(2)
+        for _ in range(num_queries):
+            c_top_of_book(book, out.ctypes)
+        return out
+    
+    @njit(cache=True)
+    def depth_kernel(book, num_queries):
+        prices = np.empty(10)
+        volumes = np.empty(10, dtype=np.uint64)
+        for _ in range(num_queries):
+            c_depth_into(book, 0, prices.ctypes, volumes.ctypes, 10)
+            c_depth_into(book, 1, prices.ctypes, volumes.ctypes, 10)
+        return prices
+
+@contextmanager
+def quiet_interpreter():
+    """Keep GC pauses and thread-switch checks out of a timed region."""
+    # Collect now and move survivors to the permanent generation, so nothing
+    # left over from setup is traced again while collection is off
+    gc.collect()
+    gc.freeze()
+    gc.disable()
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1.0)
+    try:
+        yield
+    finally:
+        sys.setswitchinterval(switch_interval)
+        gc.enable()
+        gc.unfreeze()
+
+def time_trials(setup, run, trials=TRIALS):
+    """Time `run(state)` on a fresh `setup()` state per trial.
+    
+    One untimed warm-up trial runs first, and the timed region runs with the
+    garbage collector off. Returns the median elapsed time in nanoseconds and
+    the state from the last trial.
+    """
+    timings = []
+    for trial in range(trials + 1):
+        state = setup()
+        with quiet_interpreter():
+            start = time.perf_counter_ns()
+            run(state)
+            elapsed_ns = time.perf_counter_ns() - start
+        if trial > 0:
+            timings.append(elapsed_ns)
+    return statistics.median(timings), state
+
+def print_result(title, count_label, count, elapsed_ns, unit, plural=None, details=()):
+    """Print one benchmark's median time, throughput and per-operation latency."""
+    print(f"{title}:")
+    print(f"  {count_label}: {count:,}")
+    for label, value in details:
+        print(f"  {label}: {value:,}")
+    print(f"  Time (median of {TRIALS}): {elapsed_ns / 1e6:.3f} ms")
+    print(f"  Throughput: {count * 1_000_000_000 // elapsed_ns:,} {plural or unit + 's'}/sec")
+    print(f"  Latency: {elapsed_ns // count:,} ns/{unit}")
+    print()
 
 def benchmark_order_insertion(num_orders=100000):
     """Benchmark order insertion performance."""
-    ob = OrderBook("BENCH")
-    random.seed(42)
-    
-    start = time.perf_counter()
-    for i in range(num_orders):
-        side = Side.BUY if random.random() < 0.5 else Side.SELL
-        price = random.uniform(99.0, 101.0)
-        quantity = random.randint(1, 100)
-        ob.add_limit_order(i, side, price, quantity)
-    elapsed = time.perf_counter() - start
-    
-    print("Order Insertion Benchmark:")
-    print(f"  Orders: {num_orders:,}")
-    print(f"  Time: {elapsed:.3f} sec")
-    print(f"  Throughput: {num_orders/elapsed:,.0f} orders/sec")
-    print(f"  Latency: {elapsed/num_orders*1e6:.2f} µs/order")
-    print()
+    rng = np.random.default_rng(SEED)
+    
+    # Generate the workload up front so RNG cost stays out of the timed region
+    side_of = (Side.BUY, Side.SELL)
+    sides = [side_of[s] for s in (rng.random(num_orders) >= 0.5).tolist()]
+    prices = rng.uniform(99.0, 101.0, num_orders).tolist()
+    quantities = rng.integers(1, 101, num_orders, dtype=np.int64).tolist()
+    
+    def setup():
+        ob = OrderBook("BENCH")
+        ob.reserve(num_orders)
+        return ob
+    
+    def run(ob):
+        # Bind hot attributes to locals so the loop skips LOAD_ATTR/LOAD_GLOBAL
+        add = ob.add_limit_order
+        for i in range(num_orders):
+            add(i, sides[i], prices[i], quantities[i])
+    
+    elapsed_ns, _ = time_trials(setup, run)
+    print_result("Order Insertion Benchmark", "Orders", num_orders, elapsed_ns, "order")
+
+def benchmark_order_insertion_batch(num_orders=100000):
+    """Benchmark order insertion through the batch API (one FFI call)."""
+    rng = np.random.default_rng(SEED)
+    
+    ids = np.arange(num_orders, dtype=np.uint64)
+    # Same draw and mapping as the per-order benchmark (>= 0.5 is SELL), so both
+    # runs insert an identical workload
+    sides = (rng.random(num_orders) >= 0.5).astype(np.uint8)
+    prices = rng.uniform(99.0, 101.0, num_orders)
+    quantities = rng.integers(1, 101, num_orders, dtype=np.uint64)
+    
+    def setup():
+        ob = OrderBook("BENCH")
+        ob.reserve(num_orders)
+        return ob
+    
+    def run(ob):
+        ob.add_limit_orders_batch(ids, sides, prices, quantities)
+    
+    elapsed_ns, _ = time_trials(setup, run)
+    print_result("Order Insertion Benchmark (Batch)", "Orders", num_orders, elapsed_ns, "order")
 
 def benchmark_order_cancellation(num_orders=100000):
     """Benchmark order cancellation performance."""
-    ob = OrderBook("BENCH")
-    random.seed(42)
-    
-    # Insert orders
-    for i in range(num_orders):
-        ob.add_limit_order(i, Side.BUY, random.uniform(99.0, 101.0), random.randint(1, 100))
-    
-    # Benchmark cancellation
-    start = time.perf_counter()
-    for i in range(num_orders):
-        ob.cancel_order(i)
-    elapsed = time.perf_counter() - start
-    
-    print("Order Cancellation Benchmark:")
-    print(f"  Orders: {num_orders:,}")
-    print(f"  Time: {elapsed:.3f} sec")
-    print(f"  Throughput: {num_orders/elapsed:,.0f} cancels/sec")
-    print(f"  Latency: {elapsed/num_orders*1e6:.2f} µs/cancel")
-    print()
+    rng = np.random.default_rng(SEED)
+    
+    prices = rng.uniform(99.0, 101.0, num_orders).tolist()
+    quantities = rng.integers(1, 101, num_orders, dtype=np.int64).tolist()
+    
+    def setup():
+        ob = OrderBook("BENCH")
+        ob.reserve(num_orders)
+        for i in range(num_orders):
+            ob.add_limit_order(i, Side.BUY, prices[i], quantities[i])
+        return ob
+    
+    def run(ob):
+        cancel = ob.cancel_order
+        for i in range(num_orders):
+            cancel(i)
+    
+    elapsed_ns, _ = time_trials(setup, run)
+    print_result("Order Cancellation Benchmark", "Orders", num_orders, elapsed_ns, "cancel")
 
 def benchmark_matching_engine(num_orders=10000):
     """Benchmark matching engine performance."""
-    ob = OrderBook("BENCH")
-    random.seed(42)
+    rng = np.random.default_rng(SEED)
     
-    # Place resting orders
-    for i in range(num_orders):
-        side = Side.BUY if i % 2 == 0 else Side.SELL
-        base_price = 99.0 if side == Side.BUY else 101.0
-        price = base_price + (i % 100) * 0.01
-        ob.add_limit_order(i, side, price, random.randint(1, 100))
+    # Sides alternate by order ID parity (even = BUY, odd = SELL); the side bit
+    # indexes lookup tables so neither loop branches on it
+    side_of = (Side.BUY, Side.SELL)
+    
+    # Resting orders
+    resting_sides = (np.arange(num_orders) & 1).tolist()
+    resting_prices = (np.array([99.0, 101.0])[resting_sides]
+                      + (np.arange(num_orders) % 100) * 0.01).tolist()
+    resting_quantities = rng.integers(1, 101, num_orders, dtype=np.int64).tolist()
     
-    # Benchmark aggressive orders
+    # Aggressive orders
     num_aggressive = 1000
-    start = time.perf_counter()
-    for i in range(num_orders, num_orders + num_aggressive):
-        if i % 2 == 0:
-            ob.add_limit_order(i, Side.BUY, 102.0, random.randint(1, 100))
-        else:
-            ob.add_limit_order(i, Side.SELL, 98.0, random.randint(1, 100))
-    elapsed = time.perf_counter() - start
-    
-    print("Matching Engine Benchmark:")
-    print(f"  Aggressive orders: {num_aggressive:,}")
-    print(f"  Trades executed: {ob.get_trade_count():,}")
-    print(f"  Time: {elapsed:.3f} sec")
-    print(f"  Throughput: {num_aggressive/elapsed:,.0f} orders/sec")
-    print(f"  Latency: {elapsed/num_aggressive*1e6:.2f} µs/order")
-    print()
+    ids = np.arange(num_orders, num_orders + num_aggressive)
+    sides = [side_of[s] for s in (ids & 1).tolist()]
+    prices = np.array([102.0, 98.0])[ids & 1].tolist()
+    ids = ids.tolist()
+    quantities = rng.integers(1, 101, num_aggressive, dtype=np.int64).tolist()
+    
+    def setup():
+        ob = OrderBook("BENCH")
+        for i in range(num_orders):
+            ob.add_limit_order(i, side_of[resting_sides[i]], resting_prices[i],
+                               resting_quantities[i])
+        return ob
+    
+    def run(ob):
+        add = ob.add_limit_order
+        for j in range(num_aggressive):
+            add(ids[j], sides[j], prices[j], quantities[j])
+    
+    elapsed_ns, ob = time_trials(setup, run)
+    print_result("Matching Engine Benchmark", "Aggressive orders", num_aggressive,
+                 elapsed_ns, "order", details=[("Trades executed", ob.get_trade_count())])
+    
+    # Benchmark draining the resulting trades: one object per trade vs columns
+    num_trades = ob.get_trade_count()
+    
+    def run_trade_objects(ob):
+        for trade in ob.get_trades():
+            trade.price
+    
+    elapsed_ns, _ = time_trials(lambda: ob, run_trade_objects)
+    print_result("Trade Drain Benchmark (Objects)", "Trades", num_trades, elapsed_ns, "trade")
+    
+    elapsed_ns, _ = time_trials(lambda: ob, lambda ob: ob.get_trades_arrays())
+    print_result("Trade Drain Benchmark (Columnar Arrays)", "Trades", num_trades,
+                 elapsed_ns, "trade")
 
 def benchmark_market_data(num_queries=100000):
     """Benchmark market data query performance."""
     ob = OrderBook("BENCH")
-    random.seed(42)
+    rng = np.random.default_rng(SEED)
     
     # Build orderbook
-    for i in range(10000):
+    num_resting = 10000
+    prices = rng.uniform(99.0, 101.0, num_resting).tolist()
+    quantities = rng.integers(1, 101, num_resting, dtype=np.int64).tolist()
+    for i in range(num_resting):
         side = Side.BUY if i % 2 == 0 else Side.SELL
-        ob.add_limit_order(i, side, random.uniform(99.0, 101.0), random.randint(1, 100))
+        ob.add_limit_order(i, side, prices[i], quantities[i])
+    
+    # Queries leave the book unchanged, so every trial shares it
+    def setup():
+        return ob
     
     # Benchmark best bid/ask
-    start = time.perf_counter()
-    for _ in range(num_queries):
-        bid = ob.get_best_bid()
-        ask = ob.get_best_ask()
-    elapsed = time.perf_counter() - start
-    
-    print("Market Data Query Benchmark (Best Bid/Ask):")
-    print(f"  Queries: {num_queries:,}")
-    print(f"  Time: {elapsed:.3f} sec")
-    print(f"  Throughput: {num_queries/elapsed:,.0f} queries/sec")
-    print(f"  Latency: {elapsed/num_queries*1e6:.3f} µs/query")
-    print()
+    def run_top_of_book(ob):
+        get_top_of_book = ob.get_top_of_book
+        for _ in range(num_queries):
+            bid, ask = get_top_of_book()
+    
+    elapsed_ns, _ = time_trials(setup, run_top_of_book)
+    print_result("Market Data Query Benchmark (Best Bid/Ask)", "Queries", num_queries,
+                 elapsed_ns, "query", "queries")
     
     # Benchmark depth queries
     num_depth = num_queries // 10
-    start = time.perf_counter()
-    for _ in range(num_depth):
-        bids = ob.get_bids(10)
-        asks = ob.get_asks(10)
-    elapsed = time.perf_counter() - start
-    
-    print("Market Data Query Benchmark (10 Levels):")
-    print(f"  Queries: {num_depth:,}")
-    print(f"  Time: {elapsed:.3f} sec")
-    print(f"  Throughput: {num_depth/elapsed:,.0f} queries/sec")
-    print(f"  Latency: {elapsed/num_depth*1e6:.3f} µs/query")
-    print()
+    
+    def run_depth(ob):
+        get_bids = ob.get_bids
+        get_asks = ob.get_asks
+        for _ in range(num_depth):
+            get_bids(10)
+            get_asks(10)
+    
+    elapsed_ns, _ = time_trials(setup, run_depth)
+    print_result("Market Data Query Benchmark (10 Levels)", "Queries", num_depth,
+                 elapsed_ns, "query", "queries")
+    
+    # Benchmark depth queries into preallocated buffers (no per-call allocation)
+    depth_prices = np.empty(10)
+    depth_volumes = np.empty(10, dtype=np.uint64)
+    
+    def run_depth_into(ob):
+        get_bids_into = ob.get_bids_into
+        get_asks_into = ob.get_asks_into
+        for _ in range(num_depth):
+            get_bids_into(depth_prices, depth_volumes)
+            get_asks_into(depth_prices, depth_volumes)
+    
+    elapsed_ns, _ = time_trials(setup, run_depth_into)
+    print_result("Market Data Query Benchmark (10 Levels, Preallocated)", "Queries",
+                 num_depth, elapsed_ns, "query", "queries")
+    
+    # Benchmark best bid/ask plus 10 levels per side from a single call
+    def run_snapshot(ob):
+        snapshot = ob.snapshot
+        for _ in range(num_depth):
+            snapshot(10)
+    
+    elapsed_ns, _ = time_trials(setup, run_snapshot)
+    print_result("Market Data Query Benchmark (Snapshot, 10 Levels)", "Queries",
+                 num_depth, elapsed_ns, "query", "queries")
+    
+    if njit is None:
+        print("Market Data Query Benchmark (Numba Kernel): skipped, numba not installed")
+        print()
+        return
+    
+    # Whole query loops run in compiled code; the warm-up trial compiles or
+    # loads the kernels from cache
+    elapsed_ns, _ = time_trials(setup, lambda ob: top_of_book_kernel(ob.address(), num_queries))
+    print_result("Market Data Query Benchmark (Best Bid/Ask, Numba Kernel)", "Queries",
+                 num_queries, elapsed_ns, "query", "queries")
+    
+    elapsed_ns, _ = time_trials(setup, lambda ob: depth_kernel(ob.address(), num_depth))
+    print_result("Market Data Query Benchmark (10 Levels, Numba Kernel)", "Queries",
+                 num_depth, elapsed_ns, "query", "queries")
 
 def main():
     print("=== HFT OrderBook Performance Benchmarks ===\n")
     
     benchmark_order_insertion(100000)
+    benchmark_order_insertion_batch(100000)
     benchmark_order_cancellation(100000)
     benchmark_matching_engine(10000)
     benchmark_market_data(100000)
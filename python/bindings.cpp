@@ -1,92 +1,214 @@
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
 #include <pybind11/stl.h>
+#include <algorithm>
+#include <cstdint>
+#include <limits>
+#include <stdexcept>
 #include "orderbook.hpp"
 
 namespace py = pybind11;
 
-PYBIND11_MODULE(pyorderbook, m) {
-    m.doc() = "High-frequency trading orderbook implementation";
-    
-    py::enum_<hft::Side>(m, "Side")
-        .value("BUY", hft::Side::BUY)
-        .value("SELL", hft::Side::SELL)
-        .export_values();
-    
-    py::enum_<hft::OrderType>(m, "OrderType")
-        .value("LIMIT", hft::OrderType::LIMIT)
-        .value("MARKET", hft::OrderType::MARKET)
-        .export_values();
+template <typename T>
+using CArray = py::array_t<T, py::array::c_style | py::array::forcecast>;
+
+// Contiguous array of exactly T; bind with .noconvert() so other dtypes raise
+// TypeError instead of being cast (casting wraps negatives and truncates floats)
+template <typename T>
+using ExactArray = py::array_t<T, py::array::c_style>;
+
+// Plain C-ABI entry points for native callers (e.g. numba kernels) that skip
+// the pybind11 call overhead, instantiated per bound book class and published
+// as that class's c_api. `book` must come from the same class's address(), and
+// the Python object must stay alive for the duration of the call.
+
+// Writes best bid and best ask to out[0] and out[1]; NaN marks an empty side
+template <typename Book>
+void top_of_book_entry(uintptr_t book, double* out) {
+    auto [bid, ask] = reinterpret_cast<const Book*>(book)->get_top_of_book();
+    out[0] = bid.value_or(std::numeric_limits<double>::quiet_NaN());
+    out[1] = ask.value_or(std::numeric_limits<double>::quiet_NaN());
+}
+
+// Fills the top `depth` levels of one side (0 = BUY, 1 = SELL); returns levels written
+template <typename Book>
+size_t depth_into_entry(uintptr_t book, uint8_t side, double* prices,
+                        uint64_t* volumes, size_t depth) {
+    const auto* ob = reinterpret_cast<const Book*>(book);
+    return side == static_cast<uint8_t>(hft::Side::BUY)
+               ? ob->get_bids_into(prices, volumes, depth)
+               : ob->get_asks_into(prices, volumes, depth);
+}
+
+// Registers the shared OrderBook API for one tick-policy instantiation
+template <typename Book>
+py::class_<Book> bind_order_book(py::module_& m, const char* name) {
+    py::object snapshot_type = m.attr("Snapshot");
     
-    py::class_<hft::Order>(m, "Order")
-        .def_readonly("order_id", &hft::Order::order_id)
-        .def_readonly("side", &hft::Order::side)
-        .def_readonly("price", &hft::Order::price)
-        .def_readonly("quantity", &hft::Order::quantity)
-        .def_readonly("timestamp", &hft::Order::timestamp);
+    py::class_<Book> cls(m, name);
     
-    py::class_<hft::Trade>(m, "Trade")
-        .def_readonly("buy_order_id", &hft::Trade::buy_order_id)
-        .def_readonly("sell_order_id", &hft::Trade::sell_order_id)
-        .def_readonly("price", &hft::Trade::price)
-        .def_readonly("quantity", &hft::Trade::quantity)
-        .def_readonly("timestamp", &hft::Trade::timestamp)
-        .def("__repr__", [](const hft::Trade& t) {
-            return "<Trade buy=" + std::to_string(t.buy_order_id) + 
-                   " sell=" + std::to_string(t.sell_order_id) +
-                   " price=" + std::to_string(t.price) +
-                   " qty=" + std::to_string(t.quantity) + ">";
-        });
+    // Entry point addresses for callers that bind them through ctypes/numba
+    py::dict c_api;
+    c_api["top_of_book"] = reinterpret_cast<uintptr_t>(&top_of_book_entry<Book>);
+    c_api["depth_into"] = reinterpret_cast<uintptr_t>(&depth_into_entry<Book>);
+    cls.attr("c_api") = c_api;
     
-    py::class_<hft::OrderBook>(m, "OrderBook")
-        .def(py::init<const std::string&>(), py::arg("symbol"))
-        .def("add_limit_order", &hft::OrderBook::add_limit_order,
+    return cls
+        .def("address",
+             [](const Book& ob) { return reinterpret_cast<uintptr_t>(&ob); },
+             "Address of the underlying C++ book, for this class's c_api entry "
+             "points only; valid only while this object is alive")
+        .def("reserve", &Book::reserve,
+             py::arg("order_count"),
+             "Pre-allocate storage for the given number of resting orders")
+        .def("add_limit_order", &Book::add_limit_order,
              py::arg("order_id"), py::arg("side"), py::arg("price"), py::arg("quantity"),
              "Add a limit order to the orderbook")
-        .def("add_market_order", &hft::OrderBook::add_market_order,
+        .def("add_market_order", &Book::add_market_order,
              py::arg("order_id"), py::arg("side"), py::arg("quantity"),
              "Add a market order to the orderbook")
-        .def("cancel_order", &hft::OrderBook::cancel_order,
+        .def("add_limit_orders_batch",
+             [](Book& ob, ExactArray<uint64_t> order_ids, ExactArray<uint8_t> sides,
+                CArray<double> prices, ExactArray<uint64_t> quantities) {
+                 size_t count = static_cast<size_t>(order_ids.size());
+                 if (order_ids.ndim() != 1 || sides.ndim() != 1 ||
+                     prices.ndim() != 1 || quantities.ndim() != 1 ||
+                     static_cast<size_t>(sides.size()) != count ||
+                     static_cast<size_t>(prices.size()) != count ||
+                     static_cast<size_t>(quantities.size()) != count) {
+                     throw std::invalid_argument("batch arrays must be 1-D and of equal length");
+                 }
+                 // Side is a uint8_t enum: 0 = BUY, 1 = SELL. The engine indexes
+                 // per-side arrays with it, so any other byte must be rejected here.
+                 const uint8_t* raw_sides = sides.data();
+                 for (size_t i = 0; i < count; ++i) {
+                     if (raw_sides[i] > static_cast<uint8_t>(hft::Side::SELL)) {
+                         throw std::invalid_argument("sides must be 0 (BUY) or 1 (SELL)");
+                     }
+                 }
+                 const auto* side_data = reinterpret_cast<const hft::Side*>(raw_sides);
+                 // The arrays stay referenced by this frame, so the engine loop
+                 // can run without the GIL
+                 py::gil_scoped_release release;
+                 return ob.add_limit_orders(order_ids.data(), side_data,
+                                            prices.data(), quantities.data(), count);
+             },
+             py::arg("order_ids").noconvert(), py::arg("sides").noconvert(), py::arg("prices"),
+             py::arg("quantities").noconvert(),
+             "Add limit orders from parallel arrays: uint64 order_ids, uint8 sides "
+             "(0 = BUY, 1 = SELL), float prices and uint64 quantities; "
+             "returns the number of orders accepted. The GIL is released while the "
+             "batch runs, so the book must not be used from another thread meanwhile")
+        .def("cancel_order", &Book::cancel_order,
              py::arg("order_id"),
              "Cancel an existing order")
-        .def("modify_order", &hft::OrderBook::modify_order,
+        .def("modify_order", &Book::modify_order,
              py::arg("order_id"), py::arg("new_quantity"),
              "Modify the quantity of an existing order")
-        .def("get_best_bid", &hft::OrderBook::get_best_bid,
+        .def("get_best_bid", &Book::get_best_bid,
              "Get the best bid price")
-        .def("get_best_ask", &hft::OrderBook::get_best_ask,
+        .def("get_best_ask", &Book::get_best_ask,
              "Get the best ask price")
-        .def("get_mid_price", &hft::OrderBook::get_mid_price,
+        .def("get_top_of_book", &Book::get_top_of_book,
+             "Get the best bid and best ask prices as a (bid, ask) tuple")
+        .def("get_mid_price", &Book::get_mid_price,
              "Get the mid price")
-        .def("get_spread", &hft::OrderBook::get_spread,
+        .def("get_spread", &Book::get_spread,
              "Get the bid-ask spread")
-        .def("get_bid_volume_at_price", &hft::OrderBook::get_bid_volume_at_price,
+        .def("get_bid_volume_at_price", &Book::get_bid_volume_at_price,
              py::arg("price"),
              "Get total bid volume at a specific price")
-        .def("get_ask_volume_at_price", &hft::OrderBook::get_ask_volume_at_price,
+        .def("get_ask_volume_at_price", &Book::get_ask_volume_at_price,
              py::arg("price"),
              "Get total ask volume at a specific price")
-        .def("get_total_bid_volume", &hft::OrderBook::get_total_bid_volume,
+        .def("get_total_bid_volume", &Book::get_total_bid_volume,
              "Get total volume on bid side")
-        .def("get_total_ask_volume", &hft::OrderBook::get_total_ask_volume,
+        .def("get_total_ask_volume", &Book::get_total_ask_volume,
              "Get total volume on ask side")
-        .def("get_bids", &hft::OrderBook::get_bids,
+        .def("get_bids", &Book::get_bids,
              py::arg("depth") = 10,
              "Get top N bid levels")
-        .def("get_asks", &hft::OrderBook::get_asks,
+        .def("get_asks", &Book::get_asks,
              py::arg("depth") = 10,
              "Get top N ask levels")
-        .def("get_trades", &hft::OrderBook::get_trades,
+        .def("get_bids_into",
+             [](const Book& ob, py::array_t<double, py::array::c_style> prices_out,
+                py::array_t<uint64_t, py::array::c_style> volumes_out) {
+                 size_t depth = static_cast<size_t>(std::min(prices_out.size(), volumes_out.size()));
+                 return ob.get_bids_into(prices_out.mutable_data(), volumes_out.mutable_data(), depth);
+             },
+             py::arg("prices_out").noconvert(), py::arg("volumes_out").noconvert(),
+             "Fill preallocated float64/uint64 arrays with the top bid levels; "
+             "returns the number of levels written")
+        .def("get_asks_into",
+             [](const Book& ob, py::array_t<double, py::array::c_style> prices_out,
+                py::array_t<uint64_t, py::array::c_style> volumes_out) {
+                 size_t depth = static_cast<size_t>(std::min(prices_out.size(), volumes_out.size()));
+                 return ob.get_asks_into(prices_out.mutable_data(), volumes_out.mutable_data(), depth);
+             },
+             py::arg("prices_out").noconvert(), py::arg("volumes_out").noconvert(),
+             "Fill preallocated float64/uint64 arrays with the top ask levels; "
+             "returns the number of levels written")
+        .def("snapshot",
+             [snapshot_type](const Book& ob, size_t depth) {
+                 // Size each side to the levels present, so a large depth never
+                 // allocates more than the book holds; snapshot() writes at most
+                 // min(depth, level count) entries per side
+                 size_t bid_depth = std::min(depth, ob.get_bid_level_count());
+                 size_t ask_depth = std::min(depth, ob.get_ask_level_count());
+                 py::array_t<double> bid_prices(bid_depth), ask_prices(ask_depth);
+                 py::array_t<uint64_t> bid_volumes(bid_depth), ask_volumes(ask_depth);
+                 hft::BookSnapshot snap = ob.snapshot(
+                     bid_prices.mutable_data(), bid_volumes.mutable_data(),
+                     ask_prices.mutable_data(), ask_volumes.mutable_data(), depth);
+                 return snapshot_type(snap.best_bid, snap.best_ask,
+                                      bid_prices, bid_volumes, ask_prices, ask_volumes);
+             },
+             py::arg("depth") = 10,
+             "Get best bid/ask and the top N levels of both sides from one consistent "
+             "read, as a Snapshot(bid, ask, bid_prices, bid_volumes, ask_prices, "
+             "ask_volumes) with NumPy level arrays")
+        .def("get_trades", &Book::get_trades,
              "Get all executed trades")
-        .def("get_order_count", &hft::OrderBook::get_order_count,
+        .def("get_trades_arrays",
+             [](const Book& ob, size_t start) {
+                 const auto& trades = ob.get_trades();
+                 size_t count = start < trades.size() ? trades.size() - start : 0;
+                 py::array_t<uint64_t> buy_ids(count), sell_ids(count), quantities(count);
+                 py::array_t<double> prices(count);
+                 // Copied out column by column: the trade vector may reallocate
+                 // later, so views into it could dangle
+                 uint64_t* buy_out = buy_ids.mutable_data();
+                 uint64_t* sell_out = sell_ids.mutable_data();
+                 double* price_out = prices.mutable_data();
+                 uint64_t* quantity_out = quantities.mutable_data();
+                 for (size_t i = 0; i < count; ++i) {
+                     const hft::Trade& trade = trades[start + i];
+                     buy_out[i] = trade.buy_order_id;
+                     sell_out[i] = trade.sell_order_id;
+                     price_out[i] = trade.price;
+                     quantity_out[i] = trade.quantity;
+                 }
+                 return py::make_tuple(buy_ids, sell_ids, prices, quantities);
+             },
+             py::arg("start") = 0,
+             "Get executed trades from index `start` onward as NumPy columns "
+             "(buy_ids, sell_ids, prices, quantities)")
+        .def("get_order_count", &Book::get_order_count,
              "Get current number of orders in the book")
-        .def("get_trade_count", &hft::OrderBook::get_trade_count,
+        .def("get_bid_level_count", &Book::get_bid_level_count,
+             "Get the number of bid price levels")
+        .def("get_ask_level_count", &Book::get_ask_level_count,
+             "Get the number of ask price levels")
+        .def("get_trade_count", &Book::get_trade_count,
              "Get total number of executed trades")
-        .def("get_symbol", &hft::OrderBook::get_symbol,
+        .def("get_symbol", &Book::get_symbol,
              "Get the symbol for this orderbook")
-        .def("__repr__", [](const hft::OrderBook& ob) {
-            std::string result = "<OrderBook symbol=" + ob.get_symbol();
-            auto bid = ob.get_best_bid();
-            auto ask = ob.get_best_ask();
+        .def("get_tick_size", &Book::get_tick_size,
+             "Get the minimum price increment; prices are rounded to it on entry")
+        .def("__repr__", [name](const Book& ob) {
+            std::string result = std::string("<") + name + " symbol=" + ob.get_symbol();
+            auto [bid, ask] = ob.get_top_of_book();
             if (bid && ask) {
                 result += " bid=" + std::to_string(*bid) + 
                          " ask=" + std::to_string(*ask);
@@ -95,3 +217,70 @@ PYBIND11_MODULE(pyorderbook, m) {
             return result;
         });
 }
+
+PYBIND11_MODULE(pyorderbook, m) {
+    m.doc() = "High-frequency trading orderbook implementation";
+    
+    py::enum_<hft::Side>(m, "Side")
+        .value("BUY", hft::Side::BUY)
+        .value("SELL", hft::Side::SELL)
+        .export_values();
+    
+    py::enum_<hft::OrderType>(m, "OrderType")
+        .value("LIMIT", hft::OrderType::LIMIT)
+        .value("MARKET", hft::OrderType::MARKET)
+        .export_values();
+    
+    py::class_<hft::Order>(m, "Order")
+        .def_readonly("order_id", &hft::Order::order_id)
+        .def_readonly("side", &hft::Order::side)
+        .def_readonly("price_ticks", &hft::Order::price_ticks)
+        .def_readonly("quantity", &hft::Order::quantity)
+        .def_readonly("timestamp", &hft::Order::timestamp);
+    
+    py::class_<hft::Trade>(m, "Trade")
+        .def_readonly("buy_order_id", &hft::Trade::buy_order_id)
+        .def_readonly("sell_order_id", &hft::Trade::sell_order_id)
+        .def_readonly("price", &hft::Trade::price)
+        .def_readonly("quantity", &hft::Trade::quantity)
+        .def_readonly("timestamp", &hft::Trade::timestamp)
+        .def("__repr__", [](const hft::Trade& t) {
+            return "<Trade buy=" + std::to_string(t.buy_order_id) + 
+                   " sell=" + std::to_string(t.sell_order_id) +
+                   " price=" + std::to_string(t.price) +
+                   " qty=" + std::to_string(t.quantity) + ">";
+        });
+    
+    m.attr("Snapshot") = py::module_::import("collections").attr("namedtuple")(
+        "Snapshot", py::make_tuple("bid", "ask", "bid_prices", "bid_volumes",
+                                   "ask_prices", "ask_volumes"));
+    
+    using Book_1e_2 = hft::FixedTickOrderBook<1, 100>;
+    using Book_1e_4 = hft::FixedTickOrderBook<1, 10000>;
+    
+    bind_order_book<hft::OrderBook>(m, "OrderBook")
+        .def(py::init<const std::string&, double>(), py::arg("symbol"), py::arg("tick_size") = 0.01);
+    bind_order_book<Book_1e_2>(m, "OrderBook_1e_2")
+        .def(py::init<const std::string&>(), py::arg("symbol"));
+    bind_order_book<Book_1e_4>(m, "OrderBook_1e_4")
+        .def(py::init<const std::string&>(), py::arg("symbol"));
+    // Generic fallback name alongside the fixed-tick variants
+    m.attr("OrderBook_runtime") = m.attr("OrderBook");
+    
+    // Module-level c_api is the runtime OrderBook's; each variant class carries its own
+    m.attr("c_api") = m.attr("OrderBook").attr("c_api");
+    
+    m.def("create_order_book",
+          [](const std::string& symbol, double tick_size) -> py::object {
+              if (tick_size == hft::FixedTick<1, 100>::tick_size()) {
+                  return py::type::of<Book_1e_2>()(symbol);
+              }
+              if (tick_size == hft::FixedTick<1, 10000>::tick_size()) {
+                  return py::type::of<Book_1e_4>()(symbol);
+              }
+              return py::type::of<hft::OrderBook>()(symbol, tick_size);
+          },
+          py::arg("symbol"), py::arg("tick_size") = 0.01,
+          "Create an orderbook, using a compile-time tick variant when one matches "
+          "tick_size and OrderBook_runtime otherwise");
+}
@@ -23,20 +23,22 @@ def main():
     ob.add_limit_order(5, Side.SELL, 150.15, 200)
     ob.add_limit_order(6, Side.SELL, 150.20, 150)
     
+    # One snapshot call reads best prices and depth from the same book state
+    snap = ob.snapshot(depth=5)
     print(f"Orders in book: {ob.get_order_count()}")
-    print(f"Best bid: ${ob.get_best_bid():.2f}")
-    print(f"Best ask: ${ob.get_best_ask():.2f}")
-    print(f"Mid price: ${ob.get_mid_price():.4f}")
-    print(f"Spread: ${ob.get_spread():.4f}\n")
+    print(f"Best bid: ${snap.bid:.2f}")
+    print(f"Best ask: ${snap.ask:.2f}")
+    print(f"Mid price: ${(snap.bid + snap.ask) / 2:.4f}")
+    print(f"Spread: ${snap.ask - snap.bid:.4f}\n")
     
     # Display market depth
     print("=== Market Depth ===")
     print("Bids:")
-    for price, volume in ob.get_bids(5):
+    for price, volume in zip(snap.bid_prices, snap.bid_volumes):
         print(f"  ${price:.2f} - {volume} shares")
     
     print("Asks:")
-    for price, volume in ob.get_asks(5):
+    for price, volume in zip(snap.ask_prices, snap.ask_volumes):
         print(f"  ${price:.2f} - {volume} shares")
     print()
     
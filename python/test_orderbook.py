@@ -5,7 +5,11 @@ Unit tests for the HFT OrderBook Python bindings.
 import sys
 sys.path.insert(0, '.')
 
+import ctypes
+import math
 import unittest
+import numpy as np
+import pyorderbook
 from pyorderbook import OrderBook, Side
 
 class TestOrderBook(unittest.TestCase):
@@ -74,6 +78,26 @@ class TestOrderBook(unittest.TestCase):
         self.assertEqual(self.ob.get_best_ask(), 101.0)
         self.assertEqual(self.ob.get_ask_volume_at_price(101.0), 20)
     
+    def test_trades_arrays(self):
+        """Test columnar trade export against the object API."""
+        self.ob.add_limit_order(1, Side.SELL, 100.0, 50)
+        self.ob.add_limit_order(2, Side.SELL, 101.0, 30)
+        self.ob.add_market_order(3, Side.BUY, 60)
+        self.ob.add_limit_order(4, Side.BUY, 101.0, 5)
+        
+        buy_ids, sell_ids, prices, quantities = self.ob.get_trades_arrays()
+        self.assertEqual(buy_ids.dtype, np.uint64)
+        self.assertEqual(prices.dtype, np.float64)
+        self.assertEqual(list(zip(buy_ids, sell_ids, prices, quantities)),
+                         [(t.buy_order_id, t.sell_order_id, t.price, t.quantity)
+                          for t in self.ob.get_trades()])
+        
+        # Incremental drain from an index
+        buy_ids, sell_ids, prices, quantities = self.ob.get_trades_arrays(start=2)
+        self.assertEqual(buy_ids.tolist(), [4])
+        self.assertEqual(quantities.tolist(), [5])
+        self.assertEqual(len(self.ob.get_trades_arrays(start=10)[0]), 0)
+    
     def test_cancel_order(self):
         """Test order cancellation."""
         self.ob.add_limit_order(1, Side.BUY, 100.0, 50)
@@ -107,6 +131,51 @@ class TestOrderBook(unittest.TestCase):
         self.assertEqual(bids[0][0], 100.0)
         self.assertEqual(bids[0][1], 10)
     
+    def test_depth_into_buffers(self):
+        """Test market depth written into preallocated arrays."""
+        self.ob.add_limit_order(1, Side.BUY, 100.0, 10)
+        self.ob.add_limit_order(2, Side.BUY, 99.0, 20)
+        self.ob.add_limit_order(3, Side.SELL, 101.0, 30)
+        
+        prices = np.zeros(3)
+        volumes = np.zeros(3, dtype=np.uint64)
+        self.assertEqual(self.ob.get_bids_into(prices, volumes), 2)
+        self.assertEqual(prices[:2].tolist(), [100.0, 99.0])
+        self.assertEqual(volumes[:2].tolist(), [10, 20])
+        
+        self.assertEqual(self.ob.get_asks_into(prices, volumes), 1)
+        self.assertEqual(prices[0], 101.0)
+        self.assertEqual(volumes[0], 30)
+        
+        # Buffers must already have the right dtype; no silent copies
+        with self.assertRaises(TypeError):
+            self.ob.get_bids_into(prices, np.zeros(3, dtype=np.int32))
+    
+    def test_snapshot(self):
+        """Test best prices and depth returned from a single snapshot call."""
+        snap = self.ob.snapshot()
+        self.assertIsNone(snap.bid)
+        self.assertIsNone(snap.ask)
+        self.assertEqual(len(snap.bid_prices), 0)
+        
+        self.ob.add_limit_order(1, Side.BUY, 100.0, 10)
+        self.ob.add_limit_order(2, Side.BUY, 99.0, 20)
+        self.ob.add_limit_order(3, Side.SELL, 101.0, 30)
+        
+        snap = self.ob.snapshot(depth=1)
+        self.assertEqual((snap.bid, snap.ask), self.ob.get_top_of_book())
+        self.assertEqual(snap.bid_prices.tolist(), [100.0])
+        self.assertEqual(snap.bid_volumes.tolist(), [10])
+        self.assertEqual(list(zip(snap.ask_prices, snap.ask_volumes)), self.ob.get_asks())
+        
+        # Arrays are sized by the levels present, not the requested depth
+        self.assertEqual(self.ob.get_bid_level_count(), 2)
+        self.assertEqual(self.ob.get_ask_level_count(), 1)
+        snap = self.ob.snapshot(depth=10**10)
+        self.assertEqual(snap.bid_prices.tolist(), [100.0, 99.0])
+        self.assertEqual(snap.ask_volumes.tolist(), [30])
+        self.assertEqual(len(OrderBook("EMPTY").snapshot(10**10).bid_prices), 0)
+    
     def test_spread(self):
         """Test bid-ask spread calculation."""
         self.ob.add_limit_order(1, Side.BUY, 100.0, 50)
@@ -114,6 +183,136 @@ class TestOrderBook(unittest.TestCase):
         
         self.assertEqual(self.ob.get_mid_price(), 100.5)
         self.assertEqual(self.ob.get_spread(), 1.0)
+    
+    def test_tick_size(self):
+        """Test prices are rounded to the book's tick size."""
+        self.assertEqual(self.ob.get_tick_size(), 0.01)
+        
+        ob = OrderBook("ES", tick_size=0.25)
+        ob.add_limit_order(1, Side.BUY, 4500.10, 5)
+        self.assertEqual(ob.get_best_bid(), 4500.0)
+        
+        with self.assertRaises(ValueError):
+            OrderBook("BAD", tick_size=0.0)
+    
+    def test_fixed_tick_variants(self):
+        """Test compile-time tick variants and the factory fallback."""
+        ob = pyorderbook.OrderBook_1e_2("TEST")
+        self.assertEqual(ob.get_tick_size(), 0.01)
+        ob.add_limit_order(1, Side.BUY, 100.004, 10)
+        ob.add_limit_order(2, Side.SELL, 100.0, 4)
+        self.assertEqual(ob.get_trades()[0].price, 100.0)
+        self.assertEqual(ob.get_bid_volume_at_price(100.0), 6)
+        
+        self.assertIsInstance(pyorderbook.create_order_book("TEST"),
+                              pyorderbook.OrderBook_1e_2)
+        self.assertIsInstance(pyorderbook.create_order_book("TEST", 0.0001),
+                              pyorderbook.OrderBook_1e_4)
+        fallback = pyorderbook.create_order_book("ES", 0.25)
+        self.assertIsInstance(fallback, pyorderbook.OrderBook_runtime)
+        self.assertEqual(fallback.get_tick_size(), 0.25)
+    
+    def test_c_api(self):
+        """Test the C entry points of every book class against the Python-level queries."""
+        self.assertEqual(pyorderbook.c_api, OrderBook.c_api)
+        books = [self.ob, pyorderbook.create_order_book("TEST"),
+                 pyorderbook.OrderBook_1e_4("TEST")]
+        
+        for ob in books:
+            with self.subTest(book=type(ob).__name__):
+                api = type(ob).c_api
+                top_of_book = ctypes.CFUNCTYPE(None, ctypes.c_size_t, ctypes.c_void_p)(
+                    api["top_of_book"])
+                depth_into = ctypes.CFUNCTYPE(
+                    ctypes.c_size_t, ctypes.c_size_t, ctypes.c_uint8,
+                    ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t)(api["depth_into"])
+                
+                out = np.empty(2)
+                top_of_book(ob.address(), out.ctypes.data)
+                self.assertTrue(math.isnan(out[0]) and math.isnan(out[1]))
+                
+                ob.add_limit_order(1, Side.BUY, 100.0, 50)
+                ob.add_limit_order(2, Side.SELL, 101.0, 30)
+                ob.add_limit_order(3, Side.SELL, 102.0, 20)
+                top_of_book(ob.address(), out.ctypes.data)
+                self.assertEqual(tuple(out), ob.get_top_of_book())
+                
+                prices = np.zeros(5)
+                volumes = np.zeros(5, dtype=np.uint64)
+                count = depth_into(ob.address(), 1, prices.ctypes.data, volumes.ctypes.data, 5)
+                self.assertEqual(count, 2)
+                self.assertEqual(list(zip(prices[:count], volumes[:count])), ob.get_asks(5))
+    
+    def test_repr_and_hash(self):
+        """Test repr reads only the top of book and books hash by identity."""
+        self.assertEqual(repr(self.ob), "<OrderBook symbol=TEST orders=0>")
+        self.assertEqual(repr(pyorderbook.OrderBook_1e_2("ES")),
+                         "<OrderBook_1e_2 symbol=ES orders=0>")
+        
+        for i in range(1000):
+            self.ob.add_limit_order(i, Side.BUY, 50.0 + i * 0.01, 1)
+        self.ob.add_limit_order(1000, Side.SELL, 100.0, 1)
+        self.assertEqual(repr(self.ob),
+                         "<OrderBook symbol=TEST bid=59.990000 ask=100.000000 orders=1001>")
+        
+        # Usable as dict keys in multi-symbol harnesses; same symbol, distinct books
+        books = {self.ob: 1, OrderBook("TEST"): 2}
+        self.assertEqual(len(books), 2)
+        self.assertEqual(books[self.ob], 1)
+    
+    def test_top_of_book(self):
+        """Test combined best bid/ask query."""
+        self.assertEqual(self.ob.get_top_of_book(), (None, None))
+        
+        self.ob.add_limit_order(1, Side.BUY, 100.0, 50)
+        self.assertEqual(self.ob.get_top_of_book(), (100.0, None))
+        
+        self.ob.add_limit_order(2, Side.SELL, 101.0, 30)
+        self.assertEqual(self.ob.get_top_of_book(), (100.0, 101.0))
+    
+    def test_add_limit_orders_batch(self):
+        """Test batch insertion from NumPy arrays."""
+        ids = np.array([1, 2, 3, 3], dtype=np.uint64)
+        sides = np.array([0, 0, 1, 1], dtype=np.uint8)
+        prices = np.array([100.0, 99.0, 101.0, 102.0])
+        quantities = np.array([10, 20, 30, 40], dtype=np.uint64)
+        
+        accepted = self.ob.add_limit_orders_batch(ids, sides, prices, quantities)
+        self.assertEqual(accepted, 3)  # Duplicate ID rejected
+        self.assertEqual(self.ob.get_best_bid(), 100.0)
+        self.assertEqual(self.ob.get_best_ask(), 101.0)
+        self.assertEqual(self.ob.get_ask_volume_at_price(101.0), 30)
+        
+        with self.assertRaises(ValueError):
+            self.ob.add_limit_orders_batch(ids, sides[:2], prices, quantities)
+    
+    def test_add_limit_orders_batch_rejects_invalid_input(self):
+        """Test batch insertion validates sides and shapes before touching the book."""
+        ids = np.array([1, 2, 3], dtype=np.uint64)
+        prices = np.array([100.0, 99.0, 101.0])
+        quantities = np.array([10, 20, 30], dtype=np.uint64)
+        
+        with self.assertRaises(ValueError):
+            self.ob.add_limit_orders_batch(ids, np.array([0, 2, 255], dtype=np.uint8),
+                                           prices, quantities)
+        with self.assertRaises(ValueError):
+            self.ob.add_limit_orders_batch(ids, np.zeros((3, 1), dtype=np.uint8),
+                                           prices, quantities)
+        
+        # IDs, sides and quantities are never cast: negatives would wrap and
+        # floats would truncate
+        sides = np.array([0, 0, 1], dtype=np.uint8)
+        with self.assertRaises(TypeError):
+            self.ob.add_limit_orders_batch(ids, sides, prices,
+                                           np.array([-3, 5, 1], dtype=np.int64))
+        with self.assertRaises(TypeError):
+            self.ob.add_limit_orders_batch(np.array([1, -2, 3], dtype=np.int64), sides,
+                                           prices, quantities)
+        with self.assertRaises(TypeError):
+            self.ob.add_limit_orders_batch(ids, np.array([0.7, 0.0, 1.0]), prices, quantities)
+        with self.assertRaises(TypeError):
+            self.ob.add_limit_orders_batch(ids, sides, prices, np.array([1.9, 2.0, 3.0]))
+        self.assertEqual(self.ob.get_order_count(), 0)
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,43 +4,282 @@
 
 namespace hft {
 
-OrderBook::OrderBook(const std::string& symbol)
-    : symbol_(symbol), timestamp_counter_(0) {}
+Slot OrderTable::allocate(uint64_t id, Side s, uint64_t qty, LevelMap::iterator level_it) {
+    Slot slot;
+    if (!free_slots.empty()) {
+        slot = free_slots.back();
+        free_slots.pop_back();
+        quantity[slot] = qty;
+        order_id[slot] = id;
+        side[slot] = s;
+        level[slot] = level_it;
+    } else {
+        slot = static_cast<Slot>(quantity.size());
+        quantity.push_back(qty);
+        next.push_back(NULL_SLOT);
+        prev.push_back(NULL_SLOT);
+        order_id.push_back(id);
+        side.push_back(s);
+        level.push_back(level_it);
+    }
+    return slot;
+}
+
+void OrderTable::reserve(size_t count) {
+    quantity.reserve(count);
+    next.reserve(count);
+    prev.reserve(count);
+    order_id.reserve(count);
+    side.reserve(count);
+    level.reserve(count);
+    free_slots.reserve(count);
+}
+
+void OrderTable::append(PriceLevel& lvl, Slot slot) {
+    next[slot] = NULL_SLOT;
+    prev[slot] = lvl.tail;
+    if (lvl.tail != NULL_SLOT) {
+        next[lvl.tail] = slot;
+    } else {
+        lvl.head = slot;
+    }
+    lvl.tail = slot;
+    lvl.total_volume += quantity[slot];
+}
+
+void OrderTable::unlink(PriceLevel& lvl, Slot slot) {
+    Slot before = prev[slot];
+    Slot after = next[slot];
+    if (before != NULL_SLOT) {
+        next[before] = after;
+    } else {
+        lvl.head = after;
+    }
+    if (after != NULL_SLOT) {
+        prev[after] = before;
+    } else {
+        lvl.tail = before;
+    }
+    lvl.total_volume -= quantity[slot];
+}
+
+OrderIndex::OrderIndex() : mask_(0), shift_(64), size_(0) {
+    rehash(16);
+}
+
+Slot OrderIndex::find(uint64_t order_id) const {
+    for (size_t i = home(order_id);; i = (i + 1) & mask_) {
+        const Entry& entry = entries_[i];
+        if (entry.slot == NULL_SLOT || entry.order_id == order_id) {
+            return entry.slot;
+        }
+    }
+}
+
+void OrderIndex::insert(uint64_t order_id, Slot slot) {
+    // Keep the load factor at or below 1/2
+    if ((size_ + 1) * 2 > entries_.size()) {
+        rehash(entries_.size() * 2);
+    }
+    size_t i = home(order_id);
+    while (entries_[i].slot != NULL_SLOT) {
+        i = (i + 1) & mask_;
+    }
+    entries_[i] = {order_id, slot};
+    ++size_;
+}
 
-bool OrderBook::add_limit_order(uint64_t order_id, Side side, double price, uint64_t quantity) {
-    if (orders_.find(order_id) != orders_.end()) {
+Slot OrderIndex::erase(uint64_t order_id) {
+    size_t i = home(order_id);
+    for (;; i = (i + 1) & mask_) {
+        if (entries_[i].slot == NULL_SLOT) {
+            return NULL_SLOT;
+        }
+        if (entries_[i].order_id == order_id) {
+            break;
+        }
+    }
+    Slot removed = entries_[i].slot;
+    
+    // Backward-shift: pull each following entry into the hole unless its
+    // home bucket lies cyclically in (hole, j], where it must stay
+    for (size_t j = (i + 1) & mask_; entries_[j].slot != NULL_SLOT; j = (j + 1) & mask_) {
+        size_t h = home(entries_[j].order_id);
+        bool stays = (i <= j) ? (i < h && h <= j) : (i < h || h <= j);
+        if (!stays) {
+            entries_[i] = entries_[j];
+            i = j;
+        }
+    }
+    entries_[i].slot = NULL_SLOT;
+    --size_;
+    return removed;
+}
+
+void OrderIndex::reserve(size_t count) {
+    size_t capacity = entries_.size();
+    while (capacity < count * 2) {
+        capacity *= 2;
+    }
+    if (capacity != entries_.size()) {
+        rehash(capacity);
+    }
+}
+
+void OrderIndex::rehash(size_t capacity) {
+    std::vector<Entry> old = std::move(entries_);
+    entries_.assign(capacity, Entry{0, NULL_SLOT});
+    mask_ = capacity - 1;
+    shift_ = 64;
+    for (size_t c = capacity; c > 1; c >>= 1) {
+        --shift_;
+    }
+    size_ = 0;
+    for (const Entry& entry : old) {
+        if (entry.slot != NULL_SLOT) {
+            insert(entry.order_id, entry.slot);
+        }
+    }
+}
+
+LevelIndex::LevelIndex()
+    : base_(0), levels_(WINDOW), occupied_(WINDOW / WORD_BITS, 0) {}
+
+void LevelIndex::recenter(int64_t key) {
+    // Nothing is indexed while the side is empty, so only the origin moves
+    base_ = static_cast<uint64_t>(key) - WINDOW / 2;
+}
+
+bool LevelIndex::find(int64_t key, LevelMap::iterator& level_it) const {
+    if (!covers(key)) {
+        return false;
+    }
+    size_t bucket = static_cast<size_t>(offset(key));
+    if (!(occupied_[bucket / WORD_BITS] >> (bucket % WORD_BITS) & 1)) {
+        return false;
+    }
+    level_it = levels_[bucket];
+    return true;
+}
+
+bool LevelIndex::next_occupied(int64_t key, LevelMap::iterator& level_it) const {
+    if (!covers(key)) {
+        return false;
+    }
+    size_t bucket = static_cast<size_t>(offset(key));
+    size_t word = bucket / WORD_BITS;
+    // Bits strictly above the bucket in its own word, then whole later words
+    uint64_t bits = occupied_[word] & ((~uint64_t{0} << (bucket % WORD_BITS)) << 1);
+    while (bits == 0) {
+        if (++word == occupied_.size()) {
+            return false;
+        }
+        bits = occupied_[word];
+    }
+    level_it = levels_[word * WORD_BITS + static_cast<size_t>(__builtin_ctzll(bits))];
+    return true;
+}
+
+void LevelIndex::insert(int64_t key, LevelMap::iterator level_it) {
+    if (!covers(key)) {
+        return;
+    }
+    size_t bucket = static_cast<size_t>(offset(key));
+    levels_[bucket] = level_it;
+    occupied_[bucket / WORD_BITS] |= uint64_t{1} << (bucket % WORD_BITS);
+}
+
+void LevelIndex::erase(int64_t key) {
+    if (!covers(key)) {
+        return;
+    }
+    size_t bucket = static_cast<size_t>(offset(key));
+    occupied_[bucket / WORD_BITS] &= ~(uint64_t{1} << (bucket % WORD_BITS));
+}
+
+RuntimeTick::RuntimeTick(double tick_size)
+    : tick_size_(tick_size), ticks_per_unit_(1.0 / tick_size) {
+    if (!(tick_size > 0.0) || !std::isfinite(ticks_per_unit_)) {
+        throw std::invalid_argument("tick_size must be positive");
+    }
+}
+
+template <typename TickPolicy>
+BasicOrderBook<TickPolicy>::BasicOrderBook(const std::string& symbol, TickPolicy ticks)
+    : symbol_(symbol), ticks_(ticks),
+      timestamp_counter_(0), books_{LevelMap(&level_pool_), LevelMap(&level_pool_)},
+      best_level_{nullptr, nullptr}, total_volume_{0, 0} {}
+
+template <typename TickPolicy>
+void BasicOrderBook<TickPolicy>::reserve(size_t order_count) {
+    table_.reserve(order_count);
+    orders_.reserve(order_count);
+}
+
+template <typename TickPolicy>
+std::optional<int64_t> BasicOrderBook<TickPolicy>::to_ticks(double price) const {
+    double scaled = price * ticks_.ticks_per_unit();
+    // Reject NaN and anything outside int64 range before rounding
+    if (!(scaled < static_cast<double>(std::numeric_limits<int64_t>::max()))) {
+        return std::nullopt;
+    }
+    int64_t price_ticks = std::llround(scaled);
+    if (price_ticks <= 0) {
+        return std::nullopt;
+    }
+    return price_ticks;
+}
+
+template <typename TickPolicy>
+bool BasicOrderBook<TickPolicy>::add_limit_order(uint64_t order_id, Side side, double price,
+                                                 uint64_t quantity) {
+    auto price_ticks = to_ticks(price);
+    if (!price_ticks) {
+        return false; // Invalid price
+    }
+    return add_limit_order_ticks(order_id, side, *price_ticks, quantity);
+}
+
+template <typename TickPolicy>
+bool BasicOrderBook<TickPolicy>::add_limit_order_ticks(uint64_t order_id, Side side,
+                                                       int64_t price_ticks, uint64_t quantity) {
+    if (orders_.contains(order_id)) {
         return false; // Order ID already exists
     }
     
-    if (quantity == 0 || price <= 0.0) {
+    if (quantity == 0) {
         return false; // Invalid order parameters
     }
     
-    auto order = std::make_shared<Order>(order_id, side, price, quantity, timestamp_counter_++);
-    orders_[order_id] = order;
+    Order order(order_id, side, price_ticks, quantity, timestamp_counter_++);
     
     // Try to match the order first
     match_order(order);
     
     // If there's remaining quantity, add to book
-    if (order->quantity > 0) {
-        if (side == Side::BUY) {
-            auto& level = bids_.try_emplace(price, price).first->second;
-            level.add_order(order);
-        } else {
-            auto& level = asks_.try_emplace(price, price).first->second;
-            level.add_order(order);
-        }
-    } else {
-        // Order fully filled, remove from tracking
-        orders_.erase(order_id);
+    if (order.quantity > 0) {
+        rest_order(order);
     }
     
     return true;
 }
 
-bool OrderBook::add_market_order(uint64_t order_id, Side side, uint64_t quantity) {
-    if (orders_.find(order_id) != orders_.end()) {
+template <typename TickPolicy>
+size_t BasicOrderBook<TickPolicy>::add_limit_orders(const uint64_t* order_ids,
+                                                    const Side* sides, const double* prices,
+                                                    const uint64_t* quantities, size_t count) {
+    size_t accepted = 0;
+    for (size_t i = 0; i < count; ++i) {
+        if (add_limit_order(order_ids[i], sides[i], prices[i], quantities[i])) {
+            ++accepted;
+        }
+    }
+    return accepted;
+}
+
+template <typename TickPolicy>
+bool BasicOrderBook<TickPolicy>::add_market_order(uint64_t order_id, Side side, uint64_t quantity) {
+    if (orders_.contains(order_id)) {
         return false;
     }
     
@@ -49,52 +288,39 @@ bool OrderBook::add_market_order(uint64_t order_id, Side side, uint64_t quantity
     }
     
     // Market orders use sentinel value to distinguish from limit orders
-    auto order = std::make_shared<Order>(order_id, side, MARKET_ORDER_PRICE, quantity, 
-                                        timestamp_counter_++, OrderType::MARKET);
-    orders_[order_id] = order;
-    
-    match_order(order);
+    Order order(order_id, side, MARKET_ORDER_TICKS, quantity,
+                timestamp_counter_++, OrderType::MARKET);
     
     // Market orders should not rest in the book
-    orders_.erase(order_id);
+    match_order(order);
     
     return true;
 }
 
-bool OrderBook::cancel_order(uint64_t order_id) {
-    auto it = orders_.find(order_id);
-    if (it == orders_.end()) {
+template <typename TickPolicy>
+bool BasicOrderBook<TickPolicy>::cancel_order(uint64_t order_id) {
+    Slot slot = orders_.erase(order_id);
+    if (slot == NULL_SLOT) {
         return false;
     }
     
-    auto order = it->second;
-    
-    // Remove from appropriate side
-    if (order->side == Side::BUY) {
-        auto level_it = bids_.find(order->price);
-        if (level_it != bids_.end()) {
-            level_it->second.remove_order(order_id);
-            if (level_it->second.is_empty()) {
-                bids_.erase(level_it);
-            }
-        }
-    } else {
-        auto level_it = asks_.find(order->price);
-        if (level_it != asks_.end()) {
-            level_it->second.remove_order(order_id);
-            if (level_it->second.is_empty()) {
-                asks_.erase(level_it);
-            }
-        }
+    // The slot carries its level, so no price search is needed
+    auto level_it = table_.level[slot];
+    size_t side = side_index(table_.side[slot]);
+    total_volume_[side] -= table_.quantity[slot];
+    table_.unlink(level_it->second, slot);
+    if (level_it->second.is_empty()) {
+        remove_level(side, level_it);
     }
     
-    orders_.erase(it);
+    table_.release(slot);
     return true;
 }
 
-bool OrderBook::modify_order(uint64_t order_id, uint64_t new_quantity) {
-    auto it = orders_.find(order_id);
-    if (it == orders_.end()) {
+template <typename TickPolicy>
+bool BasicOrderBook<TickPolicy>::modify_order(uint64_t order_id, uint64_t new_quantity) {
+    Slot slot = orders_.find(order_id);
+    if (slot == NULL_SLOT) {
         return false;
     }
     
@@ -102,137 +328,165 @@ bool OrderBook::modify_order(uint64_t order_id, uint64_t new_quantity) {
         return cancel_order(order_id);
     }
     
-    auto order = it->second;
-    uint64_t old_quantity = order->quantity;
+    uint64_t old_quantity = table_.quantity[slot];
     
     // If quantity increases, lose time priority (move to back of queue)
     if (new_quantity > old_quantity) {
         // Cancel and re-add to lose time priority
-        Side side = order->side;
-        double price = order->price;
+        Side side = table_.side[slot];
+        int64_t price_ticks = table_.level[slot]->second.price_ticks;
         
         cancel_order(order_id);
-        add_limit_order(order_id, side, price, new_quantity);
+        add_limit_order_ticks(order_id, side, price_ticks, new_quantity);
         return true;
     }
     
     // Quantity decrease: maintain time priority, just update quantity
-    if (order->side == Side::BUY) {
-        auto level_it = bids_.find(order->price);
-        if (level_it != bids_.end()) {
-            level_it->second.total_volume += (new_quantity - old_quantity);
-        }
-    } else {
-        auto level_it = asks_.find(order->price);
-        if (level_it != asks_.end()) {
-            level_it->second.total_volume += (new_quantity - old_quantity);
-        }
-    }
-    
-    order->quantity = new_quantity;
+    uint64_t reduction = old_quantity - new_quantity;
+    table_.level[slot]->second.total_volume -= reduction;
+    total_volume_[side_index(table_.side[slot])] -= reduction;
+    table_.quantity[slot] = new_quantity;
     return true;
 }
 
-void OrderBook::match_order(std::shared_ptr<Order> order) {
-    if (order->side == Side::BUY) {
-        // Match buy order with asks
-        while (order->quantity > 0 && !asks_.empty()) {
-            auto& best_ask_level = asks_.begin()->second;
-            
-            // For market orders, match at any price; for limit orders, check price
-            if (order->type == OrderType::LIMIT && order->price < best_ask_level.price) {
-                break; // No more matches possible
-            }
-            
-            auto& passive_order = best_ask_level.orders.front();
-            uint64_t trade_quantity = std::min(order->quantity, passive_order->quantity);
-            
-            // Buy order is aggressive, sell order (passive_order) is passive
-            execute_trade(order, passive_order, trade_quantity);
-            
-            order->quantity -= trade_quantity;
-            passive_order->quantity -= trade_quantity;
-            
-            if (passive_order->quantity == 0) {
-                orders_.erase(passive_order->order_id);
-                best_ask_level.orders.pop_front();
-                best_ask_level.total_volume -= trade_quantity;
-                
-                if (best_ask_level.is_empty()) {
-                    asks_.erase(asks_.begin());
-                }
-            } else {
-                best_ask_level.total_volume -= trade_quantity;
-            }
+template <typename TickPolicy>
+void BasicOrderBook<TickPolicy>::match_order(Order& order) {
+    // Match against the opposite side's book
+    size_t own = side_index(order.side);
+    size_t opposite = own ^ 1;
+    LevelMap& book = books_[opposite];
+    PriceLevel*& best = best_level_[opposite];
+    
+    // In priority-key space a resting level crosses when its key is at most
+    // the negated key of the incoming order, whichever side it is on
+    int64_t crossing_key = -level_key(order.side, order.price_ticks);
+    
+    // Trade IDs are written by side index: [0] = buy, [1] = sell
+    uint64_t trade_ids[2];
+    trade_ids[own] = order.order_id;
+    
+    while (order.quantity > 0 && best) {
+        PriceLevel& level = *best;
+        
+        // For market orders, match at any price; for limit orders, check price
+        if (order.type == OrderType::LIMIT && book.begin()->first > crossing_key) {
+            break; // No more matches possible
         }
-    } else {
-        // Match sell order with bids
-        while (order->quantity > 0 && !bids_.empty()) {
-            auto& best_bid_level = bids_.begin()->second;
-            
-            // For market orders, match at any price; for limit orders, check price
-            if (order->type == OrderType::LIMIT && order->price > best_bid_level.price) {
-                break; // No more matches possible
-            }
-            
-            auto& passive_order = best_bid_level.orders.front();
-            uint64_t trade_quantity = std::min(order->quantity, passive_order->quantity);
-            
-            // Sell order is aggressive, buy order (passive_order) is passive
-            execute_trade(passive_order, order, trade_quantity);
-            
-            order->quantity -= trade_quantity;
-            passive_order->quantity -= trade_quantity;
+        
+        Slot passive = level.head;
+        uint64_t& passive_quantity = table_.quantity[passive];
+        uint64_t trade_quantity = std::min(order.quantity, passive_quantity);
+        
+        // The passive order sets the price
+        trade_ids[opposite] = table_.order_id[passive];
+        execute_trade(trade_ids[0], trade_ids[1], level.price_ticks, trade_quantity);
+        
+        order.quantity -= trade_quantity;
+        passive_quantity -= trade_quantity;
+        level.total_volume -= trade_quantity;
+        total_volume_[opposite] -= trade_quantity;
+        
+        if (passive_quantity == 0) {
+            orders_.erase(table_.order_id[passive]);
+            table_.unlink(level, passive);
+            table_.release(passive);
             
-            if (passive_order->quantity == 0) {
-                orders_.erase(passive_order->order_id);
-                best_bid_level.orders.pop_front();
-                best_bid_level.total_volume -= trade_quantity;
-                
-                if (best_bid_level.is_empty()) {
-                    bids_.erase(bids_.begin());
-                }
-            } else {
-                best_bid_level.total_volume -= trade_quantity;
+            if (level.is_empty()) {
+                remove_level(opposite, book.begin());
             }
         }
     }
 }
 
-void OrderBook::execute_trade(std::shared_ptr<Order> buy_order,
-                              std::shared_ptr<Order> sell_order,
-                              uint64_t quantity) {
-    // Determine which order was on the book first (passive order)
-    // Trade executes at passive order's price
-    auto passive_order = (buy_order->timestamp < sell_order->timestamp) ? buy_order : sell_order;
+template <typename TickPolicy>
+void BasicOrderBook<TickPolicy>::rest_order(const Order& order) {
+    size_t side = side_index(order.side);
+    LevelMap& book = books_[side];
+    PriceLevel*& best = best_level_[side];
+    int64_t key = level_key(order.side, order.price_ticks);
     
+    LevelIndex& index = level_index_[side];
+    if (book.empty()) {
+        index.recenter(key);
+    }
+    
+    // A price at or through the top of book sits at begin(), so hinting there
+    // resolves the slot without a tree descent. Deeper prices inside the tick
+    // window are found in their bucket, or inserted just before the next
+    // occupied bucket; only prices outside the window search the tree.
+    LevelMap::iterator level_it;
+    LevelMap::iterator hint;
+    if (!best || key <= book.begin()->first) {
+        level_it = book.try_emplace(book.begin(), key, order.price_ticks);
+        best = &level_it->second;
+    } else if (index.find(key, level_it)) {
+        // Existing level
+    } else if (index.next_occupied(key, hint)) {
+        level_it = book.try_emplace(hint, key, order.price_ticks);
+    } else {
+        level_it = book.try_emplace(key, order.price_ticks).first;
+    }
+    index.insert(key, level_it);
+    
+    Slot slot = table_.allocate(order.order_id, order.side, order.quantity, level_it);
+    table_.append(level_it->second, slot);
+    total_volume_[side] += order.quantity;
+    orders_.insert(order.order_id, slot);
+}
+
+template <typename TickPolicy>
+void BasicOrderBook<TickPolicy>::remove_level(size_t side, LevelMap::iterator level_it) {
+    LevelMap& book = books_[side];
+    PriceLevel*& best = best_level_[side];
+    bool was_best = &level_it->second == best;
+    level_index_[side].erase(level_it->first);
+    auto next_it = book.erase(level_it);
+    if (was_best) {
+        // Erasing the best level leaves its in-order neighbour on top
+        best = next_it != book.end() ? &next_it->second : nullptr;
+    }
+}
+
+template <typename TickPolicy>
+void BasicOrderBook<TickPolicy>::execute_trade(uint64_t buy_order_id, uint64_t sell_order_id,
+                                               int64_t price_ticks, uint64_t quantity) {
     Trade trade{
-        buy_order->order_id,
-        sell_order->order_id,
-        passive_order->price, // Trade executes at passive order's price
+        buy_order_id,
+        sell_order_id,
+        to_price(price_ticks), // Trade executes at passive order's price
         quantity,
         timestamp_counter_++
     };
     trades_.push_back(trade);
 }
 
-std::optional<double> OrderBook::get_best_bid() const {
-    if (bids_.empty()) {
+template <typename TickPolicy>
+std::optional<double> BasicOrderBook<TickPolicy>::get_best_bid() const {
+    const PriceLevel* best = best_level_[BID];
+    if (!best) {
         return std::nullopt;
     }
-    return bids_.begin()->first;
+    return to_price(best->price_ticks);
 }
 
-std::optional<double> OrderBook::get_best_ask() const {
-    if (asks_.empty()) {
+template <typename TickPolicy>
+std::optional<double> BasicOrderBook<TickPolicy>::get_best_ask() const {
+    const PriceLevel* best = best_level_[ASK];
+    if (!best) {
         return std::nullopt;
     }
-    return asks_.begin()->first;
+    return to_price(best->price_ticks);
+}
+
+template <typename TickPolicy>
+std::pair<std::optional<double>, std::optional<double>>
+BasicOrderBook<TickPolicy>::get_top_of_book() const {
+    return {get_best_bid(), get_best_ask()};
 }
 
-std::optional<double> OrderBook::get_mid_price() const {
-    auto bid = get_best_bid();
-    auto ask = get_best_ask();
+template <typename TickPolicy>
+std::optional<double> BasicOrderBook<TickPolicy>::get_mid_price() const {
+    auto [bid, ask] = get_top_of_book();
     
     if (!bid || !ask) {
         return std::nullopt;
@@ -241,9 +495,9 @@ std::optional<double> OrderBook::get_mid_price() const {
     return (*bid + *ask) / 2.0;
 }
 
-std::optional<double> OrderBook::get_spread() const {
-    auto bid = get_best_bid();
-    auto ask = get_best_ask();
+template <typename TickPolicy>
+std::optional<double> BasicOrderBook<TickPolicy>::get_spread() const {
+    auto [bid, ask] = get_top_of_book();
     
     if (!bid || !ask) {
         return std::nullopt;
@@ -252,58 +506,91 @@ std::optional<double> OrderBook::get_spread() const {
     return *ask - *bid;
 }
 
-uint64_t OrderBook::get_bid_volume_at_price(double price) const {
-    auto it = bids_.find(price);
-    return it != bids_.end() ? it->second.total_volume : 0;
-}
-
-uint64_t OrderBook::get_ask_volume_at_price(double price) const {
-    auto it = asks_.find(price);
-    return it != asks_.end() ? it->second.total_volume : 0;
-}
-
-uint64_t OrderBook::get_total_bid_volume() const {
-    uint64_t total = 0;
-    for (const auto& [price, level] : bids_) {
-        total += level.total_volume;
+template <typename TickPolicy>
+uint64_t BasicOrderBook<TickPolicy>::get_bid_volume_at_price(double price) const {
+    auto price_ticks = to_ticks(price);
+    if (!price_ticks) {
+        return 0;
     }
-    return total;
+    auto it = books_[BID].find(level_key(Side::BUY, *price_ticks));
+    return it != books_[BID].end() ? it->second.total_volume : 0;
 }
 
-uint64_t OrderBook::get_total_ask_volume() const {
-    uint64_t total = 0;
-    for (const auto& [price, level] : asks_) {
-        total += level.total_volume;
+template <typename TickPolicy>
+uint64_t BasicOrderBook<TickPolicy>::get_ask_volume_at_price(double price) const {
+    auto price_ticks = to_ticks(price);
+    if (!price_ticks) {
+        return 0;
     }
-    return total;
+    auto it = books_[ASK].find(level_key(Side::SELL, *price_ticks));
+    return it != books_[ASK].end() ? it->second.total_volume : 0;
 }
 
-std::vector<std::pair<double, uint64_t>> OrderBook::get_bids(size_t depth) const {
+template <typename TickPolicy>
+std::vector<std::pair<double, uint64_t>> BasicOrderBook<TickPolicy>::get_bids(size_t depth) const {
     std::vector<std::pair<double, uint64_t>> result;
-    result.reserve(std::min(depth, bids_.size()));
+    result.reserve(std::min(depth, books_[BID].size()));
     
     size_t count = 0;
-    for (const auto& [price, level] : bids_) {
+    for (const auto& [key, level] : books_[BID]) {
         if (count >= depth) break;
-        result.emplace_back(price, level.total_volume);
+        result.emplace_back(to_price(level.price_ticks), level.total_volume);
         ++count;
     }
     
     return result;
 }
 
-std::vector<std::pair<double, uint64_t>> OrderBook::get_asks(size_t depth) const {
+template <typename TickPolicy>
+std::vector<std::pair<double, uint64_t>> BasicOrderBook<TickPolicy>::get_asks(size_t depth) const {
     std::vector<std::pair<double, uint64_t>> result;
-    result.reserve(std::min(depth, asks_.size()));
+    result.reserve(std::min(depth, books_[ASK].size()));
     
     size_t count = 0;
-    for (const auto& [price, level] : asks_) {
+    for (const auto& [key, level] : books_[ASK]) {
         if (count >= depth) break;
-        result.emplace_back(price, level.total_volume);
+        result.emplace_back(to_price(level.price_ticks), level.total_volume);
         ++count;
     }
     
     return result;
 }
 
+template <typename TickPolicy>
+size_t BasicOrderBook<TickPolicy>::get_bids_into(double* prices, uint64_t* volumes,
+                                                 size_t depth) const {
+    return copy_levels(books_[BID], prices, volumes, depth);
+}
+
+template <typename TickPolicy>
+size_t BasicOrderBook<TickPolicy>::get_asks_into(double* prices, uint64_t* volumes,
+                                                 size_t depth) const {
+    return copy_levels(books_[ASK], prices, volumes, depth);
+}
+
+template <typename TickPolicy>
+BookSnapshot BasicOrderBook<TickPolicy>::snapshot(double* bid_prices, uint64_t* bid_volumes,
+                                                  double* ask_prices, uint64_t* ask_volumes,
+                                                  size_t depth) const {
+    auto [bid, ask] = get_top_of_book();
+    return BookSnapshot{bid, ask,
+                        copy_levels(books_[BID], bid_prices, bid_volumes, depth),
+                        copy_levels(books_[ASK], ask_prices, ask_volumes, depth)};
+}
+
+template <typename TickPolicy>
+size_t BasicOrderBook<TickPolicy>::copy_levels(const LevelMap& book, double* prices,
+                                               uint64_t* volumes, size_t depth) const {
+    size_t count = 0;
+    for (auto it = book.begin(); it != book.end() && count < depth; ++it, ++count) {
+        prices[count] = to_price(it->second.price_ticks);
+        volumes[count] = it->second.total_volume;
+    }
+    return count;
+}
+
+template class BasicOrderBook<RuntimeTick>;
+template class BasicOrderBook<FixedTick<1, 100>>;
+template class BasicOrderBook<FixedTick<1, 10000>>;
+
 } // namespace hft
@@ -1,5 +1,8 @@
 #include <gtest/gtest.h>
 #include <gmock/gmock.h>
+#include <map>
+#include <random>
+#include <unordered_map>
 #include "orderbook.hpp"
 
 using namespace hft;
@@ -23,7 +26,6 @@ protected:
         EXPECT_GE(ob->get_order_count(), 0);
         
         // Trade count should be monotonically increasing
-        static size_t last_trade_count = 0;
         EXPECT_GE(ob->get_trade_count(), last_trade_count);
         last_trade_count = ob->get_trade_count();
         
@@ -42,6 +44,7 @@ protected:
     }
     
     std::unique_ptr<OrderBook> ob;
+    size_t last_trade_count = 0;
 };
 
 TEST_F(OrderBookTest, InitialState) {
@@ -80,6 +83,10 @@ TEST_F(OrderBookTest, AddBothSides) {
     EXPECT_EQ(ob->get_mid_price().value(), 100.5);
     EXPECT_EQ(ob->get_spread().value(), 1.0);
     
+    auto [bid, ask] = ob->get_top_of_book();
+    EXPECT_EQ(bid.value(), 100.0);
+    EXPECT_EQ(ask.value(), 101.0);
+    
     check_invariants();
 }
 
@@ -297,6 +304,244 @@ TEST_F(OrderBookTest, ModifyOrderDecreaseKeepsTimePriority) {
     EXPECT_EQ(ob->get_bid_volume_at_price(100.0), 100); // 50 + 50
 }
 
+TEST_F(OrderBookTest, BestLevelCacheTracksRemovals) {
+    ob->add_limit_order(1, Side::BUY, 100.0, 10);
+    ob->add_limit_order(2, Side::BUY, 99.0, 20);
+    ob->add_limit_order(3, Side::BUY, 98.0, 30);
+    ob->add_limit_order(4, Side::SELL, 101.0, 10);
+    ob->add_limit_order(5, Side::SELL, 102.0, 10);
+    
+    // Removing a non-best level leaves the cached best untouched
+    EXPECT_TRUE(ob->cancel_order(2));
+    EXPECT_EQ(ob->get_best_bid().value(), 100.0);
+    
+    // Emptying the best level through a match promotes the next level
+    ob->add_limit_order(6, Side::SELL, 100.0, 10);
+    EXPECT_EQ(ob->get_best_bid().value(), 98.0);
+    
+    // A better price replaces the cached best
+    ob->add_limit_order(7, Side::SELL, 100.5, 10);
+    EXPECT_EQ(ob->get_best_ask().value(), 100.5);
+    
+    EXPECT_TRUE(ob->cancel_order(7));
+    EXPECT_TRUE(ob->cancel_order(4));
+    EXPECT_EQ(ob->get_best_ask().value(), 102.0);
+    EXPECT_TRUE(ob->cancel_order(5));
+    EXPECT_FALSE(ob->get_best_ask().has_value());
+    
+    check_invariants();
+}
+
+TEST_F(OrderBookTest, PricesRoundToTicks) {
+    EXPECT_EQ(ob->get_tick_size(), 0.01);
+    
+    // Prices within half a tick share a level
+    ob->add_limit_order(1, Side::BUY, 100.004, 10);
+    ob->add_limit_order(2, Side::BUY, 99.996, 20);
+    EXPECT_EQ(ob->get_best_bid().value(), 100.0);
+    EXPECT_EQ(ob->get_bid_volume_at_price(100.0), 30);
+    
+    ob->add_limit_order(3, Side::SELL, 150.15, 10);
+    EXPECT_EQ(ob->get_best_ask().value(), 150.15);
+    
+    // Prices that round to zero ticks are rejected
+    EXPECT_FALSE(ob->add_limit_order(4, Side::BUY, 0.004, 10));
+    
+    OrderBook quarters("ES", 0.25);
+    quarters.add_limit_order(1, Side::SELL, 4500.30, 5);
+    EXPECT_EQ(quarters.get_best_ask().value(), 4500.25);
+    
+    EXPECT_THROW(OrderBook("BAD", 0.0), std::invalid_argument);
+    EXPECT_THROW(OrderBook("BAD", -0.01), std::invalid_argument);
+}
+
+TEST_F(OrderBookTest, RecycledSlotsKeepTimePriority) {
+    ob->reserve(4);
+    ob->add_limit_order(1, Side::BUY, 100.0, 10);
+    ob->add_limit_order(2, Side::BUY, 100.0, 20);
+    
+    // Order 3 reuses order 1's slot but must still queue behind order 2
+    EXPECT_TRUE(ob->cancel_order(1));
+    ob->add_limit_order(3, Side::BUY, 100.0, 30);
+    
+    ob->add_limit_order(4, Side::SELL, 100.0, 25);
+    auto trades = ob->get_trades();
+    ASSERT_EQ(trades.size(), 2);
+    EXPECT_EQ(trades[0].buy_order_id, 2);
+    EXPECT_EQ(trades[1].buy_order_id, 3);
+    EXPECT_EQ(ob->get_bid_volume_at_price(100.0), 25);
+    
+    check_invariants();
+}
+
+TEST_F(OrderBookTest, BatchInsertion) {
+    const uint64_t ids[] = {1, 2, 3, 3};
+    const Side sides[] = {Side::BUY, Side::SELL, Side::SELL, Side::BUY};
+    const double prices[] = {100.0, 101.0, 100.5, 99.0};
+    const uint64_t quantities[] = {10, 20, 30, 40};
+    
+    EXPECT_EQ(ob->add_limit_orders(ids, sides, prices, quantities, 4), 3); // Duplicate ID rejected
+    EXPECT_EQ(ob->get_order_count(), 3);
+    EXPECT_EQ(ob->get_best_bid().value(), 100.0);
+    EXPECT_EQ(ob->get_best_ask().value(), 100.5);
+    
+    check_invariants();
+}
+
+TEST_F(OrderBookTest, Snapshot) {
+    double bid_prices[2], ask_prices[2];
+    uint64_t bid_volumes[2], ask_volumes[2];
+    
+    BookSnapshot empty = ob->snapshot(bid_prices, bid_volumes, ask_prices, ask_volumes, 2);
+    EXPECT_FALSE(empty.best_bid.has_value());
+    EXPECT_FALSE(empty.best_ask.has_value());
+    EXPECT_EQ(empty.bid_levels, 0);
+    EXPECT_EQ(empty.ask_levels, 0);
+    
+    ob->add_limit_order(1, Side::BUY, 100.0, 10);
+    ob->add_limit_order(2, Side::BUY, 99.0, 20);
+    ob->add_limit_order(3, Side::BUY, 98.0, 30);
+    ob->add_limit_order(4, Side::SELL, 101.0, 40);
+    
+    BookSnapshot snap = ob->snapshot(bid_prices, bid_volumes, ask_prices, ask_volumes, 2);
+    EXPECT_EQ(snap.best_bid.value(), 100.0);
+    EXPECT_EQ(snap.best_ask.value(), 101.0);
+    ASSERT_EQ(snap.bid_levels, 2); // Capped at depth
+    EXPECT_EQ(ob->get_bid_level_count(), 3);
+    EXPECT_EQ(ob->get_ask_level_count(), 1);
+    ASSERT_EQ(snap.ask_levels, 1);
+    EXPECT_EQ(bid_prices[1], 99.0);
+    EXPECT_EQ(bid_volumes[1], 20);
+    EXPECT_EQ(ask_prices[0], 101.0);
+    EXPECT_EQ(ask_volumes[0], 40);
+}
+
+TEST_F(OrderBookTest, LevelIndexWindowEdges) {
+    // Prices inside and far outside the tick window, with both sides emptied
+    // midway so the window re-centres, must keep depth identical to a plain map
+    std::map<int64_t, uint64_t> bid_ref, ask_ref;
+    std::unordered_map<uint64_t, std::pair<Side, int64_t>> live;
+    std::mt19937 gen(7);
+    std::uniform_int_distribution<int64_t> near_dist(9000, 11000);
+    std::uniform_int_distribution<int64_t> far_dist(1, 10000000);
+    
+    uint64_t next_id = 1;
+    for (int round = 0; round < 2; ++round) {
+        for (int i = 0; i < 4000; ++i) {
+            // Bids below 100.00 and asks above it never cross
+            bool buy = gen() % 2 == 0;
+            int64_t ticks = gen() % 4 == 0 ? far_dist(gen) : near_dist(gen);
+            ticks = buy ? std::min<int64_t>(ticks, 9999) : std::max<int64_t>(ticks, 10001);
+            Side side = buy ? Side::BUY : Side::SELL;
+            ASSERT_TRUE(ob->add_limit_order(next_id, side, ticks / 100.0, 1));
+            (buy ? bid_ref : ask_ref)[ticks] += 1;
+            live[next_id++] = {side, ticks};
+            
+            if (gen() % 3 == 0) {
+                auto it = live.begin();
+                std::advance(it, gen() % live.size());
+                auto& ref = it->second.first == Side::BUY ? bid_ref : ask_ref;
+                ASSERT_TRUE(ob->cancel_order(it->first));
+                if (--ref[it->second.second] == 0) {
+                    ref.erase(it->second.second);
+                }
+                live.erase(it);
+            }
+        }
+        
+        auto bids = ob->get_bids(bid_ref.size());
+        ASSERT_EQ(bids.size(), bid_ref.size());
+        auto bid_it = bid_ref.rbegin();
+        for (const auto& [price, volume] : bids) {
+            EXPECT_EQ(price, bid_it->first / 100.0);
+            EXPECT_EQ(volume, bid_it->second);
+            ++bid_it;
+        }
+        auto asks = ob->get_asks(ask_ref.size());
+        ASSERT_EQ(asks.size(), ask_ref.size());
+        auto ask_it = ask_ref.begin();
+        for (const auto& [price, volume] : asks) {
+            EXPECT_EQ(price, ask_it->first / 100.0);
+            EXPECT_EQ(volume, ask_it->second);
+            ++ask_it;
+        }
+        uint64_t bid_total = 0, ask_total = 0;
+        for (const auto& [ticks, volume] : bid_ref) bid_total += volume;
+        for (const auto& [ticks, volume] : ask_ref) ask_total += volume;
+        EXPECT_EQ(ob->get_total_bid_volume(), bid_total);
+        EXPECT_EQ(ob->get_total_ask_volume(), ask_total);
+        EXPECT_LT(ob->get_best_bid().value(), ob->get_best_ask().value());
+        
+        // Empty both sides; the next round re-centres each window
+        for (const auto& [id, order] : live) {
+            ASSERT_TRUE(ob->cancel_order(id));
+        }
+        live.clear();
+        bid_ref.clear();
+        ask_ref.clear();
+        EXPECT_FALSE(ob->get_best_bid().has_value());
+        EXPECT_FALSE(ob->get_best_ask().has_value());
+    }
+}
+
+TEST(OrderIndexTest, MatchesReferenceMap) {
+    OrderIndex index;
+    std::unordered_map<uint64_t, Slot> reference;
+    std::mt19937 gen(42);
+    std::uniform_int_distribution<uint64_t> id_dist(0, 2000);
+    
+    for (Slot i = 0; i < 50000; ++i) {
+        uint64_t id = id_dist(gen);
+        if (gen() % 2 == 0) {
+            if (!reference.count(id)) {
+                index.insert(id, i);
+                reference[id] = i;
+            }
+        } else {
+            auto it = reference.find(id);
+            EXPECT_EQ(index.erase(id), it != reference.end() ? it->second : NULL_SLOT);
+            if (it != reference.end()) {
+                reference.erase(it);
+            }
+        }
+        ASSERT_EQ(index.size(), reference.size());
+    }
+    
+    for (uint64_t id = 0; id <= 2000; ++id) {
+        auto it = reference.find(id);
+        EXPECT_EQ(index.find(id), it != reference.end() ? it->second : NULL_SLOT);
+    }
+}
+
+TEST(FixedTickOrderBookTest, MatchesRuntimeTickBook) {
+    OrderBook runtime_book("AAPL", 0.01);
+    FixedTickOrderBook<1, 100> fixed_book("AAPL");
+    std::mt19937 gen(42);
+    std::uniform_real_distribution<> price_dist(99.0, 101.0);
+    std::uniform_int_distribution<uint64_t> qty_dist(1, 100);
+    
+    EXPECT_EQ(fixed_book.get_tick_size(), runtime_book.get_tick_size());
+    
+    for (uint64_t i = 0; i < 5000; ++i) {
+        Side side = gen() % 2 == 0 ? Side::BUY : Side::SELL;
+        double price = price_dist(gen);
+        uint64_t qty = qty_dist(gen);
+        ASSERT_EQ(fixed_book.add_limit_order(i, side, price, qty),
+                  runtime_book.add_limit_order(i, side, price, qty));
+        if (i % 3 == 0) {
+            uint64_t victim = gen() % (i + 1);
+            ASSERT_EQ(fixed_book.cancel_order(victim), runtime_book.cancel_order(victim));
+        }
+    }
+    
+    EXPECT_EQ(fixed_book.get_bids(50), runtime_book.get_bids(50));
+    EXPECT_EQ(fixed_book.get_asks(50), runtime_book.get_asks(50));
+    ASSERT_EQ(fixed_book.get_trade_count(), runtime_book.get_trade_count());
+    for (size_t i = 0; i < fixed_book.get_trade_count(); ++i) {
+        EXPECT_EQ(fixed_book.get_trades()[i].price, runtime_book.get_trades()[i].price);
+    }
+}
+
 int main(int argc, char **argv) {
     ::testing::InitGoogleTest(&argc, argv);
     return RUN_ALL_TESTS();